@@ -0,0 +1,115 @@
+"""
+按 staff_table_config.json 的列配置生成合成人员表，用于性能测试
+"""
+import json
+import os
+import random
+
+from openpyxl import Workbook
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAFF_CONFIG_PATH = os.path.join(PROJECT_DIR, 'json', 'staff_table_config.json')
+AREA_CONFIG_PATH = os.path.join(PROJECT_DIR, 'json', 'AreaConfig.json')
+
+
+def load_staff_config(path=STAFF_CONFIG_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _options(columns, key):
+    column = next(col for col in columns if col['key'] == key)
+    return [option for option in column.get('options', []) if option]
+
+
+def generate_roster(count, columns, seed=0, attendance_rate=0.9, fixed_rate=0.1,
+                    preference_rate=0.3, group_rate=0.05, max_group_size=4):
+    """
+    生成 count 名员工的记录（键为列配置中的 key）。
+    出勤、固定区域、擅长区域/环节按比例随机填写，约 group_rate 的员工作为组长带 1~max_group_size-1 名组员
+    """
+    rng = random.Random(seed)
+    teams = _options(columns, 'team_name')
+    areas = _options(columns, 'fixed_area')
+    sections = _options(columns, 'preferred_section')
+    separators = next(col for col in columns if col['key'] == 'Group_members').get('separators', [','])
+
+    roster = []
+    for i in range(count):
+        roster.append({
+            'name': f"员工{i:06d}",
+            'Attendance': 'Y' if rng.random() < attendance_rate else 'N',
+            'fixed_area': rng.choice(areas) if rng.random() < fixed_rate else '',
+            'preferred_area': rng.choice(areas) if rng.random() < preference_rate else '',
+            'preferred_section': rng.choice(sections) if rng.random() < preference_rate else '',
+            'team_name': rng.choice(teams),
+            'Group_leader': '',
+            'Group_members': '',
+        })
+
+    # 组长和组员取相邻且未分组的员工，组员与组长同队，组员名单用配置中的分隔符随机拼接
+    i = 0
+    while i < count:
+        if rng.random() < group_rate:
+            size = rng.randint(2, max_group_size)
+            group = roster[i:i + size]
+            leader = group[0]
+            for member in group[1:]:
+                member['team_name'] = leader['team_name']
+                member['fixed_area'] = leader['fixed_area']
+            leader['Group_leader'] = leader['name']
+            leader['Group_members'] = rng.choice(separators).join(member['name'] for member in group[1:])
+            i += size
+        else:
+            i += 1
+    return roster
+
+
+def generate_area_config(roster, text, area_config_path=AREA_CONFIG_PATH):
+    """
+    根据生成的人员表计算能容纳所有出勤员工的 AreaConfig.json 内容
+    """
+    with open(area_config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    defaults = {control['key']: control['default'] for control in config['uiControls']}
+    inbound_team = defaults['Inbound_team']
+    outbound_team = defaults['Outbound_team']
+    inbound_text, outbound_text = text['inbound'], text['outbound']
+
+    inbound = outbound = mobile = 0
+    for staff in roster:
+        if staff['Attendance'] != 'Y':
+            continue
+        if staff['fixed_area'] == inbound_text or (not staff['fixed_area'] and staff['team_name'] == inbound_team):
+            inbound += 1
+        elif staff['fixed_area'] == outbound_text or (not staff['fixed_area'] and staff['team_name'] == outbound_team):
+            outbound += 1
+        else:
+            mobile += 1
+    inbound += mobile // 2
+    outbound += mobile - mobile // 2
+
+    capacities = {
+        'Inbound_Front': inbound - inbound // 2,
+        'Inbound_back': inbound // 2,
+        'Outbound_Front': outbound - outbound // 2,
+        'Outbound_back': outbound // 2,
+    }
+    for control in config['uiControls']:
+        if control['key'] in capacities:
+            control['default'] = capacities[control['key']]
+            control['max'] = max(control.get('max', 100), capacities[control['key']])
+    return config
+
+
+def write_roster_xlsx(roster, path, columns):
+    """
+    以显示列名为表头写出 Excel 人员表（只写模式，适合大表）
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([col['display'] for col in columns])
+    keys = [col['key'] for col in columns]
+    for staff in roster:
+        ws.append([staff[key] for key in keys])
+    wb.save(path)
@@ -0,0 +1,208 @@
+"""
+性能基准：用合成人员表测量各环节耗时，输出 JSON 便于不同版本之间对比。
+
+用法：
+    python -m benchmarks.run_benchmarks --sizes 100 1000 10000 -o bench.json
+    python -m benchmarks.run_benchmarks --stages schedule_greedy schedule_flow --sizes 100000
+
+界面相关的环节使用 offscreen 平台运行 Qt，不会弹出窗口。
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.roster_generator import (generate_area_config, generate_roster, load_staff_config,
+                                         write_roster_xlsx)
+from utils.area_config_loader import area_config_values
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+SCHEDULER_STAGES = ['schedule_greedy', 'schedule_flow']
+QT_STAGES = ['import_staff', 'populate_table', 'search_staff']
+ALL_STAGES = SCHEDULER_STAGES + QT_STAGES
+
+
+def measure(func, repeat):
+    """
+    运行 func 共 repeat 次，返回各次耗时（秒）
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_scheduler(roster, area_config, solver, repeat):
+    from models.scheduler import Scheduler
+
+    outcome = {}
+
+    def run():
+        scheduler = Scheduler(roster, area_config, solver=solver, repair_budget=Scheduler.DEFAULT_REPAIR_BUDGET)
+        outcome['success'], _ = scheduler.schedule()
+
+    timings = measure(run, repeat)
+    return timings, {'success': outcome['success']}
+
+
+def ensure_qt_app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def bench_import(xlsx_path, repeat):
+    """
+    与界面相同的导入路径：后台线程流式读取，分批追加到表格，直到 import_finished。
+    不使用人员表快照，测量的是解析耗时
+    """
+    from PyQt6.QtCore import QEventLoop
+    from ui.staff_table import StaffTable
+
+    table = StaffTable()
+    loop = QEventLoop()
+    table.import_finished.connect(lambda rows, cancelled: loop.quit())
+    table.import_failed.connect(lambda message: loop.quit())
+
+    def run():
+        table.import_excel_async(xlsx_path, use_cache=False)
+        if table.importing:
+            loop.exec()
+
+    timings = measure(run, repeat)
+    return timings, {'rows': table.rowCount()}
+
+
+def bench_populate(roster, repeat):
+    from ui.staff_table import StaffTable
+
+    table = StaffTable()
+
+    def run():
+        table.staff_data = [dict(staff) for staff in roster]
+        table.setup_table()
+        table.populate_table()
+
+    timings = measure(run, repeat)
+    return timings, {'rows': table.rowCount()}
+
+
+def bench_search(roster, repeat):
+    from ui.main_window import StaffTableWithSearch
+
+    widget = StaffTableWithSearch()
+    table = widget.staff_table
+    table.staff_data = [dict(staff) for staff in roster]
+    table.setup_table()
+    table.populate_table()
+
+    # 依次模拟输入关键字，包含命中少量行和没有命中的情况
+    queries = [roster[len(roster) // 2]['name'], '员工00', '不存在的员工', '']
+
+    def run():
+        for query in queries:
+            widget.search_staff(query)
+
+    timings = measure(run, repeat)
+    return timings, {'queries': queries}
+
+
+def run_benchmarks(sizes, stages, repeat, seed):
+    staff_config = load_staff_config()
+    columns = staff_config['columns']
+    results = []
+
+    # 保持 QApplication 的引用直到测试结束
+    app = ensure_qt_app() if any(stage in QT_STAGES for stage in stages) else None
+
+    for size in sizes:
+        roster = generate_roster(size, columns, seed=seed)
+        area_config = area_config_values(generate_area_config(roster, staff_config['scheduler_key']))
+
+        xlsx_path = None
+        if 'import_staff' in stages:
+            handle, xlsx_path = tempfile.mkstemp(suffix='.xlsx')
+            os.close(handle)
+            write_roster_xlsx(roster, xlsx_path, columns)
+
+        try:
+            for stage in stages:
+                if stage == 'schedule_greedy':
+                    timings, info = bench_scheduler(roster, area_config, 'greedy', repeat)
+                elif stage == 'schedule_flow':
+                    timings, info = bench_scheduler(roster, area_config, 'flow', repeat)
+                elif stage == 'import_staff':
+                    timings, info = bench_import(xlsx_path, repeat)
+                elif stage == 'populate_table':
+                    timings, info = bench_populate(roster, repeat)
+                elif stage == 'search_staff':
+                    timings, info = bench_search(roster, repeat)
+                else:
+                    raise ValueError(f"未知的测试环节：{stage}")
+
+                results.append({
+                    'stage': stage,
+                    'rows': size,
+                    'repeat': repeat,
+                    'min_seconds': min(timings),
+                    'median_seconds': statistics.median(timings),
+                    'info': info,
+                })
+                print(f"{stage:<16} {size:>7} 行  最短 {min(timings):.4f}s  中位 {statistics.median(timings):.4f}s",
+                      file=sys.stderr)
+        finally:
+            if xlsx_path:
+                os.remove(xlsx_path)
+
+    return {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="自动排班系统性能基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="人员表行数")
+    parser.add_argument('--stages', nargs='+', choices=ALL_STAGES, default=ALL_STAGES, help="需要测量的环节")
+    parser.add_argument('--repeat', type=int, default=3, help="每个环节重复次数")
+    parser.add_argument('--seed', type=int, default=0, help="生成人员表的随机种子")
+    parser.add_argument('-o', '--output', help="结果 JSON 文件路径，默认输出到终端")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    report = run_benchmarks(args.sizes, args.stages, args.repeat, args.seed)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
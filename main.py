@@ -1,11 +1,76 @@
 import sys
-from PyQt6.QtWidgets import QApplication 
-from ui.main_window import MainWindow 
-import qdarkstyle
+import os
+import logging
 
-if __name__ =="__main__":
+# 设置 SCHEDULING_PROFILE=输出目录 时开启 cProfile，退出时写出计时汇总和调用栈数据
+PROFILE_DIR = os.environ.get('SCHEDULING_PROFILE')
+# 设置 SCHEDULING_STARTUP_PROFILE=1（输出到终端）或 JSON 文件路径时，测量各模块导入和启动各阶段的耗时
+STARTUP_PROFILE = os.environ.get('SCHEDULING_STARTUP_PROFILE')
+
+
+def write_profile(profile_dir):
+    from utils import profiling
+
+    os.makedirs(profile_dir, exist_ok=True)
+    profiling.stop_cprofile(os.path.join(profile_dir, 'scheduling.prof'))
+    with open(os.path.join(profile_dir, 'timings.json'), 'w', encoding='utf-8') as f:
+        f.write(profiling.report_json())
+
+
+def main():
+    startup = None
+    if STARTUP_PROFILE:
+        from utils.startup_profile import StartupProfile
+        startup = StartupProfile()
+        startup.install()
+
+    logging.basicConfig(level=logging.INFO)
+    if PROFILE_DIR:
+        from utils import profiling
+        profiling.start_cprofile()
+
+    # 界面模块在这里才导入，便于测量导入耗时；pandas/openpyxl 要到首次读写 Excel 时才导入
+    from PyQt6.QtWidgets import QApplication
     app = QApplication(sys.argv)
+    if startup:
+        startup.mark('qapplication')
+
+    import qdarkstyle
     app.setStyleSheet(qdarkstyle.load_stylesheet_pyqt6())
+    if startup:
+        startup.mark('stylesheet')
+
+    from ui.main_window import MainWindow
+    from utils.persistence import flush_all
     window = MainWindow()
+    if startup:
+        startup.mark('main_window')
+
+        staff_table = window.staff_table_with_search.staff_table
+
+        def on_first_paint():
+            startup.mark('first_paint')
+            if not staff_table.importing:
+                startup.write(STARTUP_PROFILE)
+
+        def on_default_roster(*args):
+            staff_table.import_finished.disconnect(on_default_roster)
+            staff_table.import_failed.disconnect(on_default_roster)
+            startup.mark('default_roster')
+            startup.write(STARTUP_PROFILE)
+
+        window.first_painted.connect(on_first_paint)
+        staff_table.import_finished.connect(on_default_roster)
+        staff_table.import_failed.connect(on_default_roster)
+
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    # 退出前写出尚未保存的配置修改
+    app.aboutToQuit.connect(flush_all)
+    exit_code = app.exec()
+    if PROFILE_DIR:
+        write_profile(PROFILE_DIR)
+    return exit_code
+
+
+if __name__ =="__main__":
+    sys.exit(main())
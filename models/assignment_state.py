@@ -0,0 +1,156 @@
+BUCKETS = ('inbound_front', 'inbound_back', 'outbound_front', 'outbound_back')
+
+# 岗位 -> (区域, 环节)
+BUCKET_AREA = {
+    'inbound_front': 'inbound',
+    'inbound_back': 'inbound',
+    'outbound_front': 'outbound',
+    'outbound_back': 'outbound',
+}
+
+BUCKET_SECTION = {
+    'inbound_front': 'front',
+    'inbound_back': 'back',
+    'outbound_front': 'front',
+    'outbound_back': 'back',
+}
+
+AREA_BUCKETS = {
+    'inbound': ('inbound_front', 'inbound_back'),
+    'outbound': ('outbound_front', 'outbound_back'),
+}
+
+# 岗位/区域 对应 area_config 中的容量键
+CAPACITY_KEYS = {
+    'inbound_front': 'Inbound_Front',
+    'inbound_back': 'Inbound_back',
+    'outbound_front': 'Outbound_Front',
+    'outbound_back': 'Outbound_back',
+    'inbound': 'Inbound_total',
+    'outbound': 'Outbound_total',
+}
+
+# area_config 中决定员工可去区域的团队键，这些设置不变时才能在上次结果上增量排班
+TEAM_KEYS = ('Inbound_team', 'Outbound_team', 'Mobile_team')
+
+
+def capacities_from_area_config(area_config):
+    return {key: area_config[config_key] for key, config_key in CAPACITY_KEYS.items()}
+
+
+class AssignmentState:
+    """
+    排班过程中的分配状态：
+    每个岗位用保持插入顺序的字典保存人员，另有 姓名 -> 岗位 的索引和区域计数，
+    查询岗位、空缺和总数都是 O(1)
+    """
+
+    def __init__(self, capacities):
+        self.capacities = dict(capacities)
+        self.slots = {bucket: {} for bucket in BUCKETS}
+        self.index = {}
+        self.area_counts = {area: 0 for area in AREA_BUCKETS}
+
+    @classmethod
+    def from_area_config(cls, area_config):
+        return cls(capacities_from_area_config(area_config))
+
+    def position_of(self, name):
+        return self.index.get(name)
+
+    def count(self, bucket):
+        return len(self.slots[bucket])
+
+    def area_count(self, area):
+        return self.area_counts[area]
+
+    def vacancy(self, bucket):
+        return self.capacities[bucket] - len(self.slots[bucket])
+
+    def area_vacancy(self, area):
+        return self.capacities[area] - self.area_counts[area]
+
+    def can_place(self, bucket):
+        return self.vacancy(bucket) > 0 and self.area_vacancy(BUCKET_AREA[bucket]) > 0
+
+    def place(self, name, bucket):
+        if name in self.index or self.vacancy(bucket) <= 0:
+            return False
+        self.slots[bucket][name] = None
+        self.index[name] = bucket
+        self.area_counts[BUCKET_AREA[bucket]] += 1
+        return True
+
+    def remove(self, name):
+        bucket = self.index.pop(name, None)
+        if bucket is not None:
+            del self.slots[bucket][name]
+            self.area_counts[BUCKET_AREA[bucket]] -= 1
+        return bucket
+
+    def set_capacities(self, capacities, pinned=()):
+        """
+        更新容量，只移出超出新容量的人员：每个岗位从最后放入的人员开始移出，
+        区域总数仍超出时再从该区域人数最多的岗位继续移出。pinned 中的姓名不会被移出。
+        返回按移出顺序排列的 [(姓名, 原岗位), ...]；
+        只有移出 pinned 中的人员才能满足新容量时不做任何修改，返回 None
+        """
+        # 每个岗位可移出的人员，从最后放入的开始按需取出，移出完毕前不修改状态
+        candidates = {bucket: (name for name in reversed(self.slots[bucket]) if name not in pinned)
+                      for bucket in BUCKETS}
+        counts = {bucket: len(self.slots[bucket]) for bucket in BUCKETS}
+        exhausted = set()
+        evicted = []
+
+        def evict(bucket):
+            name = next(candidates[bucket], None)
+            if name is None:
+                exhausted.add(bucket)
+                return False
+            evicted.append((name, bucket))
+            counts[bucket] -= 1
+            return True
+
+        for bucket in BUCKETS:
+            while counts[bucket] > capacities[bucket]:
+                if not evict(bucket):
+                    return None
+        for area, buckets in AREA_BUCKETS.items():
+            while sum(counts[bucket] for bucket in buckets) > capacities[area]:
+                # 从人数最多且还有可移出人员的岗位移出
+                for bucket in sorted(buckets, key=lambda bucket: counts[bucket], reverse=True):
+                    if bucket not in exhausted and evict(bucket):
+                        break
+                else:
+                    return None
+
+        self.capacities = dict(capacities)
+        for name, _ in evicted:
+            self.remove(name)
+        return evicted
+
+    def names(self, bucket):
+        return list(self.slots[bucket])
+
+    def total(self):
+        return len(self.index)
+
+
+def allowed_areas(staff, area_config, text):
+    """
+    按固定区域和团队规则返回员工可以分配的区域，未知团队返回空元组
+    """
+    fixed_area = staff.get('fixed_area', '')
+    if fixed_area == text['inbound']:
+        return ('inbound',)
+    if fixed_area == text['outbound']:
+        return ('outbound',)
+
+    team_name = staff.get('team_name', '')
+    if team_name == area_config['Inbound_team']:
+        return ('inbound',)
+    if team_name == area_config['Outbound_team']:
+        return ('outbound',)
+    if team_name == area_config['Mobile_team']:
+        return ('inbound', 'outbound')
+    return ()
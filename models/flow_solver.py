@@ -0,0 +1,158 @@
+from collections import deque
+
+from models.assignment_state import AREA_BUCKETS, BUCKET_AREA, BUCKET_SECTION, allowed_areas
+
+# 偏好未满足时的代价：区域偏好比环节偏好更重要
+AREA_MISMATCH_COST = 2
+SECTION_MISMATCH_COST = 1
+
+
+class MinCostFlow:
+    """
+    最小费用流（逐次最短增广路，Bellman-Ford/SPFA 求最短路，允许负费用残量边）
+    """
+
+    def __init__(self, node_count):
+        self.node_count = node_count
+        self.graph = [[] for _ in range(node_count)]
+        # 每条边为 [终点, 剩余容量, 费用, 反向边在终点邻接表中的下标]
+
+    def add_edge(self, u, v, capacity, cost):
+        edge_index = len(self.graph[u])
+        self.graph[u].append([v, capacity, cost, len(self.graph[v])])
+        self.graph[v].append([u, 0, -cost, len(self.graph[u]) - 1])
+        return u, edge_index
+
+    def flow_on(self, edge_ref):
+        u, edge_index = edge_ref
+        v, _, _, reverse_index = self.graph[u][edge_index]
+        return self.graph[v][reverse_index][1]
+
+    def solve(self, source, sink, max_flow=None):
+        total_flow = 0
+        total_cost = 0
+        while max_flow is None or total_flow < max_flow:
+            dist = [None] * self.node_count
+            prev = [None] * self.node_count
+            in_queue = [False] * self.node_count
+            dist[source] = 0
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                in_queue[u] = False
+                for i, (v, capacity, cost, _) in enumerate(self.graph[u]):
+                    if capacity > 0 and (dist[v] is None or dist[u] + cost < dist[v]):
+                        dist[v] = dist[u] + cost
+                        prev[v] = (u, i)
+                        if not in_queue[v]:
+                            in_queue[v] = True
+                            queue.append(v)
+
+            if dist[sink] is None:
+                break
+
+            # 沿最短路增广瓶颈流量
+            push = None if max_flow is None else max_flow - total_flow
+            v = sink
+            while v != source:
+                u, i = prev[v]
+                capacity = self.graph[u][i][1]
+                push = capacity if push is None else min(push, capacity)
+                v = u
+
+            v = sink
+            while v != source:
+                u, i = prev[v]
+                edge = self.graph[u][i]
+                edge[1] -= push
+                self.graph[v][edge[3]][1] += push
+                v = u
+
+            total_flow += push
+            total_cost += push * dist[sink]
+        return total_flow, total_cost
+
+
+def preference_weight(staff):
+    # 员工填写的偏好全部满足时可得到的分值
+    weight = 0
+    if staff.get('preferred_area', ''):
+        weight += AREA_MISMATCH_COST
+    if staff.get('preferred_section', ''):
+        weight += SECTION_MISMATCH_COST
+    return weight
+
+
+def preference_cost(staff, bucket, text):
+    cost = 0
+    preferred_area = staff.get('preferred_area', '')
+    if preferred_area and preferred_area != text[BUCKET_AREA[bucket]]:
+        cost += AREA_MISMATCH_COST
+    preferred_section = staff.get('preferred_section', '')
+    if preferred_section and preferred_section != text[BUCKET_SECTION[bucket]]:
+        cost += SECTION_MISMATCH_COST
+    return cost
+
+
+def solve_assignment(staff_list, state, area_config, text, trace=None):
+    """
+    将员工按（可分配区域，擅长区域，擅长环节）归类后建成最小费用流：
+    源点 -> 员工类别 -> 岗位 -> 区域 -> 汇点，
+    岗位和区域的剩余容量作为边容量，偏好不满足的代价作为费用。
+    网络规模只与类别数有关，与人数无关。
+
+    成功时把所有员工放入 state 并返回 (True, [])，否则 state 不变并返回 (False, 未能分配的员工列表)
+    """
+    classes = {}
+    for staff in staff_list:
+        key = (
+            allowed_areas(staff, area_config, text),
+            staff.get('preferred_area', ''),
+            staff.get('preferred_section', ''),
+        )
+        classes.setdefault(key, []).append(staff)
+
+    areas = list(AREA_BUCKETS)
+    buckets = [bucket for area in areas for bucket in AREA_BUCKETS[area]]
+    class_keys = list(classes)
+
+    # 节点编号：源点、员工类别、岗位、区域、汇点
+    source = 0
+    class_node = {key: 1 + i for i, key in enumerate(class_keys)}
+    bucket_node = {bucket: 1 + len(class_keys) + i for i, bucket in enumerate(buckets)}
+    area_node = {area: 1 + len(class_keys) + len(buckets) + i for i, area in enumerate(areas)}
+    sink = 1 + len(class_keys) + len(buckets) + len(areas)
+
+    network = MinCostFlow(sink + 1)
+    class_edges = {}
+    for key, members in classes.items():
+        network.add_edge(source, class_node[key], len(members), 0)
+        for area in key[0]:
+            for bucket in AREA_BUCKETS[area]:
+                cost = preference_cost(members[0], bucket, text)
+                class_edges[(key, bucket)] = network.add_edge(class_node[key], bucket_node[bucket], len(members), cost)
+    for bucket in buckets:
+        network.add_edge(bucket_node[bucket], area_node[BUCKET_AREA[bucket]], max(state.vacancy(bucket), 0), 0)
+    for area in areas:
+        network.add_edge(area_node[area], sink, max(state.area_vacancy(area), 0), 0)
+
+    total_flow, _ = network.solve(source, sink, len(staff_list))
+    if total_flow < len(staff_list):
+        unassigned = []
+        for key, members in classes.items():
+            placed = sum(network.flow_on(class_edges[(key, bucket)])
+                         for area in key[0] for bucket in AREA_BUCKETS[area])
+            unassigned.extend(members[placed:])
+        return False, unassigned
+
+    # 将每个类别在各岗位上的流量按名单顺序分配给具体员工
+    for key, members in classes.items():
+        remaining = iter(members)
+        for area in key[0]:
+            for bucket in AREA_BUCKETS[area]:
+                for _ in range(network.flow_on(class_edges[(key, bucket)])):
+                    name = next(remaining)['name']
+                    state.place(name, bucket)
+                    if trace is not None:
+                        trace.record(name, bucket, 'assigned', solver='flow')
+    return True, []
@@ -1,37 +1,77 @@
-import json
-import os 
-import random 
 import logging
+from collections import Counter
+from itertools import islice
 
+from models.assignment_state import AREA_BUCKETS, TEAM_KEYS, AssignmentState, allowed_areas, capacities_from_area_config
+from models.flow_solver import preference_cost, preference_weight, solve_assignment
+from models.staff_groups import group_names, has_group, members_splitter, place_groups, staff_groups
+from models.staff_store import StaffStore
+from utils.config_service import default_config_path, get_config
+from utils.profiling import count, span, timed
 
-logging.basicConfig(level=logging.INFO)
+
+def load_scheduler_text():
+    #从JSON 文件加载文本配置（只读，文件未变化时直接使用缓存）
+    return get_config(default_config_path('staff_table_config.json'))['scheduler_key']
+
+
+def compute_staff_delta(old_staff_list, new_staff_list):
+    """
+    按姓名比较两份员工名单（员工字典列表或 StaffStore），返回 (新增, 删除, 修改) 三个员工列表
+    """
+    if isinstance(old_staff_list, StaffStore):
+        old_staff_list = old_staff_list.to_records()
+    if isinstance(new_staff_list, StaffStore):
+        new_staff_list = new_staff_list.to_records()
+    old_by_name = {staff['name']: staff for staff in old_staff_list}
+    new_by_name = {staff['name']: staff for staff in new_staff_list}
+
+    added = [staff for name, staff in new_by_name.items() if name not in old_by_name]
+    removed = [staff for name, staff in old_by_name.items() if name not in new_by_name]
+    modified = [staff for name, staff in new_by_name.items()
+                if name in old_by_name and old_by_name[name] != staff]
+    return added, removed, modified
+
+
+class SchedulingCancelled(Exception):
+    """
+    排班过程中调用了 Scheduler.cancel()，或进度回调抛出以取消排班
+    """
 
 
 class Scheduler:
-    def __init__(self, staff_list,area_config):
-        logging.info(f"Initialized Scheduler with area_config: {area_config}")
-        logging.info(f"Staff list: {staff_list}")
-    
+    # 可选的排班算法：greedy 为原有的逐人贪心分配，flow 为最小费用流全局最优分配
+    SOLVERS = ('greedy', 'flow')
+    # 界面中使用的局部修复步数上限
+    DEFAULT_REPAIR_BUDGET = 1000
+    # 逐人分配时每处理多少名员工报告一次进度、检查一次取消
+    PROGRESS_INTERVAL = 500
+
+    def __init__(self, staff_list,area_config, solver='greedy', repair_budget=0, trace=None, progress=None):
+        if solver not in self.SOLVERS:
+            raise ValueError(f"未知的排班算法：{solver}")
+        self.solver = solver
+        # 贪心分配卡住时最多尝试的局部修复步数，0 表示不修复
+        self.repair_budget = repair_budget
+        self.repair_steps_left = repair_budget
+        self.repair_moves = []
+        # 可选的 DecisionTrace，为 None 时不记录任何决策
+        self.trace = trace
+        # 可选的进度回调 progress(阶段, 已完成数, 总数)，可在其他线程中调用 cancel() 取消排班，
+        # 回调中抛出 SchedulingCancelled 只取消本次排班，排班器之后仍可使用
+        self.progress = progress
+        self.cancelled = False
         self.area_config = self.parse_area_config(area_config)
         self.staff_list = self.parse_staff_list(staff_list)
         
-        #从JSON 文件加载文本配置
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(current_dir, '..', 'json', "staff_table_config.json")
-                                 
-        with open(json_path, 'r',encoding='utf-8') as f:
-            config = json.load(f)
-            self.text = config['scheduler_key']
-
-        self.inbound_front = []
-        self.inbound_back = []
-        self.outbound_front = []
-        self.outbound_back = []
-        self.mobile_team = []
-        self.inbound_count = 0
-        self.outbound_count = 0
-
-        logging.info(f"Text configuration: {self.text}")
+        self.text = load_scheduler_text()
+
+        self.state = AssignmentState.from_area_config(self.area_config)
+        self.staff_by_name = {}
+        for staff in self.staff_list:
+            self.staff_by_name.setdefault(staff['name'], staff)
+        self.grouped_staff = set()
+        self.members_splitter = members_splitter()
 
     def parse_area_config(self, area_config):
         required_heys = ['Inbound_Front', 'Inbound_back', 'Outbound_Front', 'Outbound_back', 'Inbound_total','Outbound_total']
@@ -42,6 +82,10 @@ class Scheduler:
         return area_config
     
     def parse_staff_list(self, staff_list):
+        if isinstance(staff_list, StaffStore):
+            # 按出勤列的编码筛选，只为出勤员工生成字典
+            return staff_list.records(staff_list.rows_where('Attendance', "Y"))
+
         parsed_list =[]
         for staff in staff_list:
             if not isinstance(staff, dict):
@@ -53,6 +97,36 @@ class Scheduler:
 
         return parsed_list
 
+    @property
+    def inbound_front(self):
+        return self.state.names('inbound_front')
+
+    @property
+    def inbound_back(self):
+        return self.state.names('inbound_back')
+
+    @property
+    def outbound_front(self):
+        return self.state.names('outbound_front')
+
+    @property
+    def outbound_back(self):
+        return self.state.names('outbound_back')
+
+    def preference_score(self):
+        """
+        偏好满足度：已满足的偏好分值 / 填写的偏好总分值，没有人填写偏好时为 1.0
+        """
+        stated = 0
+        satisfied = 0
+        for name, staff in self.staff_by_name.items():
+            weight = preference_weight(staff)
+            bucket = self.state.position_of(name)
+            stated += weight
+            if bucket is not None:
+                satisfied += weight - preference_cost(staff, bucket, self.text)
+        return satisfied / stated if stated else 1.0
+
     def generate_result_dict(self):
         result = {
             self.text['inbound']:{
@@ -66,170 +140,369 @@ class Scheduler:
         }
         return result
 
-    def assign_to_leader_position(self, staff, leader_position):
-        if leader_position == 'inbound_front':
-            if len(self.inbound_front) < self.area_config['Inbound_Front']:
-                self.inbound_front.append(staff['name'])
-                return True
-        elif leader_position == 'inbound_back':
-            if len(self.inbound_back)< self.area_config['Inbound_back']:
-                self.inbound_back.append(staff['name'])
-                return True
-        elif leader_position =='outbound_front':
-            if len(self.outbound_front) < self.area_config['Outbound_Front']:
-                self.outbound_front.append(staff['name'])
-                return True
-        elif leader_position == 'outbound_back':
-            if len(self.outbound_back) < self.area_config['Outbound_back']:
-                self.outbound_back.append(staff['name'])
-                return True
-        return False
-
     def get_staff_position(self, staff):
-        if staff['name'] in self.inbound_front:
-            return 'inbound_front'
-        elif staff['name'] in self.inbound_back:
-            return "inbound_back"
-        elif staff['name'] in self.outbound_front:
-            return 'outbound_front' 
-        elif staff['name'] in self.outbound_back:
-            return 'outbound_back'
-        else:
-            return None
+        return self.state.position_of(staff['name'])
         
     def assign_group(self):
-        #步骤1：获取所有唯一的组
-        all_groups = set()
-        for staff in self.staff_list:
-            if 'group_leader' in staff:
-                all_groups.add(staff['group_leader'])
-            elif 'group_member' in staff:
-                all_groups.add(staff['group_member'])
-
-        # 步骤2：为每个组建立成员列表，并确保组名唯一
-        group_mapping = {}
-        for staff in self.staff_list:
-            if 'group_leader' in staff:
-                group_name = self.normalize_group_name(staff['group_leader'])
-            elif 'group_member' in staff:
-                group_name = self.normalize_group_name(staff['group_member'])
-            else:
-                continue
-
-            if group_name not in group_mapping:
-                group_mapping[group_name] =[]
-
-            group_mapping[group_name].append(staff)
-        
-        #步骤3：分配每个组的成员
-        for group, members in group_mapping.items():
-            leader = next((member for member in members if 'group_leader' in member), None)
-            if leader and self.assign_staff(leader):
-                leader_position = self.get_staff_position(leader)
-                # 步骤4：根据Leader的位置，将其他成员分配到同一区域
-                for member in members:
-                    if member != leader:
-                        self.assign_to_leader_position(member, leader_position)
-
-    def normalize_group_name(self, group_name):
-        # 这个方法用于标准化组名，确保相似的组名被视为相同
-        #可以根据实际需求进行调整
-        return group_name.lower().strip()
+        """
+        按组整体分配：同组员工（并查集合并后的组）放在同一岗位，人数多的组先放。
+        无法整体放置的组记录警告，组员随后作为普通员工分配
+        """
+        unplaced_staff = [staff for staff in self.staff_list if not self.get_staff_position(staff)]
+        groups = staff_groups(unplaced_staff, self.members_splitter)
+        grouped_names = {staff['name'] for members in groups for staff in members}
+
+        # 不在组内、只能去某一区域的员工，分组时为他们预留位置；可分配区域按（固定区域, 队名）只判断一次
+        rules = Counter((staff.get('fixed_area', ''), staff.get('team_name', ''))
+                        for staff in unplaced_staff if staff['name'] not in grouped_names)
+        reserved = {area: 0 for area in AREA_BUCKETS}
+        for (fixed_area, team_name), members in rules.items():
+            areas = allowed_areas({'fixed_area': fixed_area, 'team_name': team_name}, self.area_config, self.text)
+            if len(areas) == 1:
+                reserved[areas[0]] += members
+
+        placed, unplaced = place_groups(groups, self.state, self.area_config, self.text, reserved, self.trace)
+        for members in placed:
+            self.grouped_staff.update(staff['name'] for staff in members)
+        for members in unplaced:
+            names = [staff['name'] for staff in members]
+            logging.warning("组（%s）无法整体安排到同一岗位，组员将分别分配", "、".join(names))
+            if self.trace is not None:
+                self.trace.record(None, None, 'group_split', members=names)
+
+    def is_group_member(self, staff):
+        # 员工填写了组长或组员，或在上次排班中随组分配
+        return staff['name'] in self.grouped_staff or has_group(staff, self.members_splitter)
     
+    def check_feasibility(self):
+        # 延迟导入，避免与 utils.vaildators 循环导入
+        from utils.vaildators import check_feasibility
+        return check_feasibility(self.staff_list, self.area_config, self.text)
+
+    def is_feasible(self):
+        # 可行性检查，未通过时记录每项违反的约束
+        report = self.check_feasibility()
+        for violation in report.violations:
+            logging.error("可行性检查未通过（%s）：%s", violation['constraint'], violation['message'])
+            if self.trace is not None:
+                self.trace.record(None, None, 'infeasible', constraint=violation['constraint'])
+        return report.feasible
+
+    def cancel(self):
+        self.cancelled = True
+
+    def report_progress(self, stage, done, total):
+        """
+        报告进度；已请求取消时抛出 SchedulingCancelled
+        """
+        if self.cancelled:
+            raise SchedulingCancelled()
+        if self.progress is not None:
+            self.progress(stage, done, total)
+
+    @timed('scheduler.schedule')
     def schedule(self):
+        self.repair_steps_left = self.repair_budget
+        self.report_progress('feasibility', 0, len(self.staff_list))
+
+        #排班前先做 O(n) 的容量检查，不可行时直接失败
+        count('scheduler.staff', len(self.staff_list))
+        with span('scheduler.feasibility'):
+            feasible = self.is_feasible()
+        if not feasible:
+            return False, None
+
+        if self.solver == 'flow':
+            return self.schedule_flow()
+        return self.schedule_greedy()
+
+    def schedule_flow(self):
+        #1.处理组，组员需要跟随组长
+        with span('scheduler.groups'):
+            self.report_progress('groups', 0, len(self.staff_list))
+            self.assign_group()
+
+        #2.其余员工（含固定区域员工）作为一个整体求最小费用流
+        with span('scheduler.flow'):
+            pending = {}
+            for staff in self.staff_list:
+                if not self.get_staff_position(staff) and staff['name'] not in pending:
+                    pending[staff['name']] = staff
+
+            self.report_progress('flow', 0, len(pending))
+            success, unassigned = solve_assignment(list(pending.values()), self.state, self.area_config, self.text, self.trace)
+            self.report_progress('flow', len(pending), len(pending))
+        if not success:
+            for staff in unassigned:
+                self.Log_assignment_error("无法为员工分配工作。", staff, {
+                    "入境总人数": self.state.area_count('inbound'),
+                    "入境总限制": self.area_config['Inbound_total'],
+                    "出境总人数": self.state.area_count('outbound'),
+                    "出境总限制": self.area_config['Outbound_total']
+                    })
+            return False, None
+
+        result_dict = self.generate_result_dict()
+        return True, result_dict
+
+    def schedule_greedy(self):
         assigned_staff = set()
 
+        # 组内的固定区域员工随组一起分配
+        group_members = {staff['name'] for members in staff_groups(self.staff_list, self.members_splitter)
+                         for staff in members}
+
         #1.处理固定区域的员工
-        for staff in self.staff_list:
-            if staff['fixed_area']:
-                if staff['fixed_area'] == self.text['inbound']:
-                    if self.assign_inbound(staff):
-                        assigned_staff.add(staff['name'])
-                    else:
-                        self.Log_assignment_error("无法为固定入境区域员工分配工作。",staff,{
-                            "入境总人数":len(self.inbound_front) + len(self.inbound_back),
-                            "入境总限制":self.area_config['Inbound_Total']
+        with span('scheduler.fixed_area'):
+            for i, staff in enumerate(self.staff_list):
+                if i % self.PROGRESS_INTERVAL == 0:
+                    self.report_progress('fixed_area', i, len(self.staff_list))
+                if staff['fixed_area'] and staff['name'] not in group_members:
+                    if staff['fixed_area'] == self.text['inbound']:
+                        if self.assign_inbound(staff):
+                            assigned_staff.add(staff['name'])
+                        else:
+                            self.Log_assignment_error("无法为固定入境区域员工分配工作。",staff,{
+                                "入境总人数":self.state.area_count('inbound'),
+                                "入境总限制":self.area_config['Inbound_total']
+                                })
+                            return False, None
+                    elif staff['fixed_area'] == self.text['outbound']:
+                        if self.assign_outbound(staff):
+                            assigned_staff.add(staff['name'])
+                        else:
+                            self.Log_assignment_error("无法为固定出境区域员工分配工作。",staff,{
+                            "出境总人数":self.state.area_count('outbound'),
+                            "出境总限制":self.area_config['Outbound_total']
                             })
-                        return False, None
-            elif staff['fixed_area'] == self.text['outbound']:
-                if self.assign_outbound(staff):
-                    assigned_staff.add(staff['name'])
-                else:
-                    self.Log_assignment_error("无法为固定出境区域员工分配工作。",staff,{
-                    "出境总人数":len(self.outbound_front)+ len(self.outbound_back),
-                    "出境总限制":self.area_config['Outbound_Total']
-                    })
-                    return False, None
+                            return False, None
             
         #2.处理组
-        self.assign_group()
-        for staff in self.staff_list:
-            if self.get_staff_position(staff):
-                assigned_staff.add(staff['name'])
+        with span('scheduler.groups'):
+            self.report_progress('groups', 0, len(self.staff_list))
+            self.assign_group()
+            for staff in self.staff_list:
+                if self.get_staff_position(staff):
+                    assigned_staff.add(staff['name'])
 
         # 3.处理剩余员工
-        for staff in self.staff_list:
-            if staff['name'] not in assigned_staff:
-                if self.assign_staff(staff):
-                    assigned_staff.add(staff['name'])
-                else:
-                    self.Log_assignment_error("无法为普通员工分配工作。",staff,{})
-                    return False, None
+        with span('scheduler.remainder'):
+            for i, staff in enumerate(self.staff_list):
+                if i % self.PROGRESS_INTERVAL == 0:
+                    self.report_progress('remainder', i, len(self.staff_list))
+                if staff['name'] not in assigned_staff:
+                    if self.repair_budget > 0 and not self.has_vacancy_for(staff):
+                        self.repair_placement(staff)
+                    # 未能随组分配的固定区域员工仍按固定区域分配
+                    if self.place_staff(staff):
+                        assigned_staff.add(staff['name'])
+                    else:
+                        self.Log_assignment_error("无法为普通员工分配工作。",staff,{})
+                        return False, None
 
         # 生成并返回排班结果字典
         result_dict = self.generate_result_dict()
         return True, result_dict
 
+    def teams_match(self, area_config):
+        # 团队设置相同时才能在当前结果上增量排班，容量变化由 reschedule 处理
+        return all(area_config.get(key) == self.area_config.get(key) for key in TEAM_KEYS)
+
+    def reschedule(self, added=(), removed=(), modified=(), area_config=None):
+        """
+        在上一次排班结果的基础上增量调整：
+        先移除删除或不再出勤的员工，再重新安置岗位不再符合规则的修改员工；
+        传入新的 area_config 时按新容量移出超出的员工（组内员工不移出），最后安置新增和被移出的员工。
+        其余员工保持原岗位，只有需要腾位置时才会通过局部修复移动。
+
+        涉及分组的变化（变化的员工在组内，或被其他员工列为组长、组员）或团队设置变化无法增量调整，
+        此时不改动当前结果，直接返回失败，由调用方完整排班。
+        新容量只能通过移出组内员工满足、可行性检查未通过或有员工无法安置时也返回失败，此时当前结果已部分调整，不应再使用。
+
+        返回 (是否成功, 排班结果字典, 岗位变化)，岗位变化为 {姓名: (原岗位, 新岗位)}，岗位为 None 表示未分配
+        """
+        if area_config is not None and not self.teams_match(area_config):
+            return False, None, {}
+        linked = group_names(self.staff_list, self.members_splitter)
+        for staff in (*added, *removed, *modified):
+            if staff['name'] in linked or self.is_group_member(staff):
+                return False, None, {}
+
+        before = {}
+        moves_start = len(self.repair_moves)
+        self.repair_steps_left = self.repair_budget
+
+        def unplace(name):
+            bucket = self.state.position_of(name)
+            before.setdefault(name, bucket)
+            self.state.remove(name)
+            self.grouped_staff.discard(name)
+
+        for staff in removed:
+            unplace(staff['name'])
+            self.staff_by_name.pop(staff['name'], None)
+
+        pending = []
+        for staff in modified:
+            name = staff['name']
+            if staff.get('Attendance') != "Y":
+                unplace(name)
+                self.staff_by_name.pop(name, None)
+                continue
+
+            self.staff_by_name[name] = staff
+            bucket = self.state.position_of(name)
+            if bucket is None or bucket not in self.staff_buckets(staff):
+                unplace(name)
+                pending.append(staff)
+
+        if area_config is not None:
+            self.area_config = self.parse_area_config(area_config)
+            evicted = self.state.set_capacities(capacities_from_area_config(self.area_config), self.grouped_staff)
+            if evicted is None:
+                return False, None, {}
+            for name, bucket in evicted:
+                before.setdefault(name, bucket)
+                pending.append(self.staff_by_name[name])
+
+        for staff in added:
+            if staff.get('Attendance') == "Y":
+                self.staff_by_name.setdefault(staff['name'], staff)
+                if self.state.position_of(staff['name']) is None:
+                    before.setdefault(staff['name'], None)
+                    pending.append(staff)
+
+        self.staff_list = list(self.staff_by_name.values())
+
+        # 与完整排班相同，先按更新后的员工和容量做可行性检查
+        if not self.is_feasible():
+            return False, None, {}
+
+        success = True
+        for i, staff in enumerate(pending):
+            if i % self.PROGRESS_INTERVAL == 0:
+                self.report_progress('reschedule', i, len(pending))
+            if self.repair_budget > 0 and not self.has_vacancy_for(staff):
+                self.repair_placement(staff)
+            if not self.place_staff(staff):
+                self.Log_assignment_error("增量排班时无法为员工分配工作。", staff, {})
+                success = False
+
+        # 局部修复移动过的员工也计入岗位变化
+        for name, from_bucket, _ in self.repair_moves[moves_start:]:
+            before.setdefault(name, from_bucket)
+
+        diff = {}
+        for name, old_bucket in before.items():
+            new_bucket = self.state.position_of(name)
+            if old_bucket != new_bucket:
+                diff[name] = (old_bucket, new_bucket)
+
+        if not success:
+            return False, None, diff
+        return True, self.generate_result_dict(), diff
+
+    def place_staff(self, staff):
+        # 固定区域优先，否则按团队规则分配
+        if staff.get('fixed_area') == self.text['inbound']:
+            return self.assign_inbound(staff)
+        if staff.get('fixed_area') == self.text['outbound']:
+            return self.assign_outbound(staff)
+        return self.assign_staff(staff)
+
+    def staff_buckets(self, staff):
+        return [bucket for area in allowed_areas(staff, self.area_config, self.text) for bucket in AREA_BUCKETS[area]]
+
+    def has_vacancy_for(self, staff):
+        return any(self.state.can_place(bucket) for bucket in self.staff_buckets(staff))
+
+    def is_movable(self, staff):
+        # 固定区域和组内员工不移动；机动队员工或没有偏好的员工可以调整到其他岗位
+        if staff.get('fixed_area') or staff['name'] in self.grouped_staff:
+            return False
+        if staff.get('team_name') == self.area_config['Mobile_team']:
+            return True
+        return not staff.get('preferred_area') and not staff.get('preferred_section')
+
+    def repair_placement(self, staff):
+        """
+        局部修复：把 staff 可用岗位中的一名可移动员工调到其他有空缺的岗位，为 staff 腾出位置。
+        每检查一名在岗员工消耗一步，步数用完即停止，返回是否腾出了位置
+        """
+        for bucket in self.staff_buckets(staff):
+            # 只取预算内的在岗员工，避免大岗位每次都整体复制
+            for name in list(islice(self.state.slots[bucket], self.repair_steps_left)):
+                if self.repair_steps_left <= 0:
+                    return False
+                self.repair_steps_left -= 1
+
+                occupant = self.staff_by_name[name]
+                if not self.is_movable(occupant):
+                    continue
+                for target in self.staff_buckets(occupant):
+                    if target == bucket:
+                        continue
+                    self.state.remove(name)
+                    if self.state.can_place(target):
+                        self.state.place(name, target)
+                        if self.has_vacancy_for(staff):
+                            self.repair_moves.append((name, bucket, target))
+                            if self.trace is not None:
+                                self.trace.record(name, target, 'repair_move', from_bucket=bucket, freed_for=staff['name'])
+                            return True
+                        self.state.remove(name)
+                    self.state.place(name, bucket)
+        return False
+
     def assign_front(self, staff, area):
         if area == self.text['outbound']:
-            front_limit = self.area_config['Outbound_Front']
-            current_front = self.outbound_front
+            bucket = 'outbound_front'
         elif area == self.text['inbound']:
-            front_limit = self.area_config['Inbound_Front']
-            current_front = self.inbound_front
+            bucket = 'inbound_front'
         else:
             logging.error(f"无效的区域：{area}")
             return False
         
-        if len(current_front) < front_limit:
-            current_front.append(staff['name'])
-            logging.info(f"成功将{staff['name']}分配到{area}前台")
+        if self.state.place(staff['name'], bucket):
+            if self.trace is not None:
+                self.trace.record(staff['name'], bucket, 'assigned')
             return True
         else:
-            logging.info(f"{area}前台已满，无法分配 {staff['name']}")
+            if self.trace is not None:
+                self.trace.record(staff['name'], bucket, 'bucket_full')
             return False
 
     def assign_back(self, staff,area):
         if area == self.text['outbound']:
-            back_limit = self.area_config['Outbound_back']
-            current_back = self.outbound_back
+            bucket = 'outbound_back'
         elif area == self.text['inbound']:
-            back_limit = self.area_config['Inbound_back']
-            current_back = self.inbound_back
+            bucket = 'inbound_back'
         else:
             logging.error(f"无效的区域：{area}")
             return False
 
-        if len(current_back) < back_limit:
-            current_back.append(staff['name'])
-            logging.info(f"成功将 {staff['name']} 分配到 {area} 后台")
+        if self.state.place(staff['name'], bucket):
+            if self.trace is not None:
+                self.trace.record(staff['name'], bucket, 'assigned')
             return True
         else:
-            logging.info(f"{area}后台已满，无法分配{staff['name']}")
+            if self.trace is not None:
+                self.trace.record(staff['name'], bucket, 'bucket_full')
             return False
 
     def assign_inbound(self, staff):
         #检查入境总人数是否已满
-        if len(self.inbound_front) + len(self.inbound_back) >= self.area_config['Inbound_total']:
-            logging.info(f"入境区域已满员，无法分配{staff['name']}")
+        if self.state.area_vacancy('inbound') <= 0:
+            if self.trace is not None:
+                self.trace.record(staff['name'], None, 'area_full', area='inbound')
             return False
 
         area = self.text['inbound']
         preferred_section = staff.get('preferred_section','')
                                       
         #检查前台和后台的空缺情况
-        front_vacancy = self.area_config['Inbound_Front'] - len(self.inbound_front)
-        back_vacancy = self.area_config['Inbound_back'] - len(self.inbound_back)
+        front_vacancy = self.state.vacancy('inbound_front')
+        back_vacancy = self.state.vacancy('inbound_back')
 
         if preferred_section == self.text['front'] and front_vacancy > 0:
             return self.assign_front(staff, area)
@@ -252,21 +525,23 @@ class Scheduler:
             return self.assign_back(staff,area)
         else:
             # 两者都没有空缺
-            logging.info(f"入境前台和后台都已满员，无法分配{staff['name']}")
+            if self.trace is not None:
+                self.trace.record(staff['name'], None, 'sections_full', area='inbound')
             return False
 
     def assign_outbound(self, staff):
         #检查出境总人数是否已满
-        if len(self.outbound_front) + len(self.outbound_back) >= self.area_config['Outbound_total']:
-            logging.info(f"出境区域已满员，无法分配 {staff['name']}")
+        if self.state.area_vacancy('outbound') <= 0:
+            if self.trace is not None:
+                self.trace.record(staff['name'], None, 'area_full', area='outbound')
             return False
         
         area = self.text['outbound']
         preferred_section = staff.get('preferred_section','')
 
         #检查前台和后台的空缺情况
-        front_vacancy = self.area_config['Outbound_Front'] - len(self.outbound_front)
-        back_vacancy = self.area_config['Outbound_back'] - len(self.outbound_back)
+        front_vacancy = self.state.vacancy('outbound_front')
+        back_vacancy = self.state.vacancy('outbound_back')
 
         if preferred_section == self.text['front'] and front_vacancy > 0:
             return self.assign_front(staff, area)
@@ -289,7 +564,8 @@ class Scheduler:
             return self.assign_back(staff, area)
         else:
             # 两者都没有空缺
-            logging.info(f"出境前台和后台都已满员，无法分配 {staff['name']}")
+            if self.trace is not None:
+                self.trace.record(staff['name'], None, 'sections_full', area='outbound')
             return False
 
 
@@ -307,8 +583,8 @@ class Scheduler:
                 return True
 
         #3.如果没有明确的偏好或上述分配失败
-        inbound_vacancy = self.area_config['Inbound_total']-(len(self.inbound_front) + len(self.inbound_back))
-        outbound_vacancy = self.area_config['Outbound_total'] - (len(self.outbound_front) + len(self.outbound_back))
+        inbound_vacancy = self.state.area_vacancy('inbound')
+        outbound_vacancy = self.state.area_vacancy('outbound')
 
         if inbound_vacancy > 0 and outbound_vacancy > 0:
             # 两者都有空缺，分配到空缺数较大的区域
@@ -324,11 +600,16 @@ class Scheduler:
             return self.assign_outbound(staff)
         else:
             # 两者都没有空缺
-            logging.info(f"出境和入境都已满员，无法分配 {staff['name']}")
+            if self.trace is not None:
+                self.trace.record(staff['name'], None, 'areas_full')
             return False
         
     def Log_assignment_error(self, message, staff, area_info):
+        if self.trace is not None:
+            self.trace.record(staff.get('name'), None, 'assignment_error', message=message, **area_info)
 
+        if not logging.getLogger().isEnabledFor(logging.ERROR):
+            return
         logging.error(f"{message}相关参数如下：")
         logging.error(f"员工信息：{staff}")
         for key, value in area_info.items():
@@ -342,9 +623,9 @@ class Scheduler:
         if team_name == self.area_config['Inbound_team']:
             if not self.assign_inbound(staff):
                 self.Log_assignment_error("无法为入境团队成员分配工作.",staff,{
-                "入境前台人数":len(self.inbound_front),
-                "入境后台人数":len(self.inbound_back),
-                "入境总人数":len(self.inbound_front) + len(self.inbound_back),
+                "入境前台人数":self.state.count('inbound_front'),
+                "入境后台人数":self.state.count('inbound_back'),
+                "入境总人数":self.state.area_count('inbound'),
                 "入境总限制":self.area_config['Inbound_total']
                 })
                 return False 
@@ -354,9 +635,9 @@ class Scheduler:
         elif team_name == self.area_config['Outbound_team']:
             if not self.assign_outbound(staff):
                 self.Log_assignment_error("无法为出境团队成员分配工作.",staff,{
-                "出境前台人数":len(self.outbound_front),
-                "出境后台人数":len(self.outbound_back),
-                "出境总人数":len(self.outbound_front) + len(self.outbound_back),
+                "出境前台人数":self.state.count('outbound_front'),
+                "出境后台人数":self.state.count('outbound_back'),
+                "出境总人数":self.state.area_count('outbound'),
                 "出境总限制":self.area_config['Outbound_total']
                 })
                 return False 
@@ -366,19 +647,21 @@ class Scheduler:
         elif team_name == self.area_config['Mobile_team']:
             if not self.assign_mobile(staff):
                 self.Log_assignment_error("无法为机动团队成员分配工作1.",staff,{
-                "出境前台人数":len(self.outbound_front),
-                "出境后台人数":len(self.outbound_back),
-                "出境总人数":len(self.outbound_front) + len(self.outbound_back),
+                "出境前台人数":self.state.count('outbound_front'),
+                "出境后台人数":self.state.count('outbound_back'),
+                "出境总人数":self.state.area_count('outbound'),
                 "出境总限制":self.area_config['Outbound_total']
                 })
                 self.Log_assignment_error("无法为机动团队成员分配工作2.",staff,{
-                "入境前台人数":len(self.inbound_front),
-                "入境后台人数":len(self.inbound_back),
-                "入境总人数":len(self.inbound_front) + len(self.inbound_back),
+                "入境前台人数":self.state.count('inbound_front'),
+                "入境后台人数":self.state.count('inbound_back'),
+                "入境总人数":self.state.area_count('inbound'),
                 "入境总限制":self.area_config['Inbound_total']
                 })
                 return False 
             return True
         else:
-            logging.error(f"未知的团队名称：{team_name}")
+            logging.error("未知的团队名称：%s", team_name)
+            if self.trace is not None:
+                self.trace.record(staff['name'], None, 'unknown_team', team_name=team_name)
             return False
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+员工分组：组长一行的 Group_leader 为组长姓名，Group_members 为按列配置分隔符拼接的组员姓名；
+组员一行也可以在 Group_leader 中填写所属组长。
+有共同成员的组用并查集合并为一个组，再按人数从多到少把每个组整体放入一个空缺足够的岗位
+"""
+import re
+
+from models.assignment_state import AREA_BUCKETS, allowed_areas
+from models.flow_solver import preference_cost
+from utils.config_service import default_config_path, get_config
+from utils.roster_loader import separator_pattern
+
+
+class UnionFind:
+    """
+    并查集（按大小合并 + 路径减半），find/union 近似 O(1)
+    """
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, item):
+        parent = self.parent
+        if item not in parent:
+            parent[item] = item
+            self.size[item] = 1
+            return item
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+
+def members_splitter():
+    """
+    按组员列配置的分隔符（与 split_list_items 相同）拆分组员名单的正则，只编译一次
+    """
+    columns = get_config(default_config_path('staff_table_config.json'))['columns']
+    members_config = next((column for column in columns if column['key'] == 'Group_members'), {})
+    return re.compile(separator_pattern(members_config))
+
+
+def linked_names(staff, splitter):
+    """
+    员工一行中与其同组的姓名：Group_leader 和 Group_members 中的全部姓名
+    """
+    members = staff.get('Group_members', '')
+    leader = str(staff.get('Group_leader', '') or '').strip()
+    if not members and not leader:
+        return []
+    if isinstance(members, list):
+        names = [str(name).strip() for name in members if str(name).strip()]
+    elif members:
+        names = [name.strip() for name in splitter.split(str(members)) if name.strip()]
+    else:
+        names = []
+    if leader:
+        names.append(leader)
+    return names
+
+
+def has_group(staff, splitter=None):
+    if splitter is None:
+        splitter = members_splitter()
+    return bool(linked_names(staff, splitter))
+
+
+def group_names(staff_list, splitter=None):
+    """
+    填写了组长或组员的员工，以及被列为组长或组员的姓名
+    """
+    if splitter is None:
+        splitter = members_splitter()
+    names = set()
+    for staff in staff_list:
+        linked = linked_names(staff, splitter)
+        if linked:
+            names.add(staff['name'])
+            names.update(linked)
+    return names
+
+
+def staff_groups(staff_list, splitter=None):
+    """
+    返回合并后的组列表，每组为按名单顺序排列的员工字典（至少 2 人）。
+    只合并 staff_list 中出现的姓名，不在名单中（如未出勤）的组员被忽略
+    """
+    if splitter is None:
+        splitter = members_splitter()
+
+    by_name = {}
+    for staff in staff_list:
+        by_name.setdefault(staff['name'], staff)
+
+    union_find = UnionFind()
+    for name, staff in by_name.items():
+        for other in linked_names(staff, splitter):
+            if other != name and other in by_name:
+                union_find.union(name, other)
+
+    # 按名单顺序遍历，组内顺序与名单一致
+    groups = {}
+    for name, staff in by_name.items():
+        if name in union_find.parent:
+            groups.setdefault(union_find.find(name), []).append(staff)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def group_areas(members, area_config, text):
+    # 所有组员都可以分配的区域
+    areas = None
+    for staff in members:
+        allowed = allowed_areas(staff, area_config, text)
+        areas = allowed if areas is None else tuple(area for area in areas if area in allowed)
+        if not areas:
+            return ()
+    return areas
+
+
+def place_groups(groups, state, area_config, text, reserved=None, trace=None):
+    """
+    按人数从多到少把每个组整体放入同一岗位。
+    候选岗位须能容纳整个组，并给 reserved（区域 -> 人数）中只能去该区域的其他员工留出位置；
+    没有这样的岗位时才占用预留的位置。候选岗位中选偏好代价最小的，其次选剩余空缺最少的（最佳适应）。
+    返回 (已放置的组, 无法整体放置的组)
+    """
+    reserved = reserved or {}
+    placed = []
+    unplaced = []
+    for members in sorted(groups, key=len, reverse=True):
+        size = len(members)
+        areas = group_areas(members, area_config, text)
+        candidates = []
+        for slack in (reserved, {}):
+            candidates = [bucket for area in areas for bucket in AREA_BUCKETS[area]
+                          if state.vacancy(bucket) >= size
+                          and state.area_vacancy(area) - slack.get(area, 0) >= size]
+            if candidates:
+                break
+        if not candidates:
+            unplaced.append(members)
+            continue
+
+        bucket = min(candidates, key=lambda candidate: (
+            sum(preference_cost(staff, candidate, text) for staff in members),
+            state.vacancy(candidate),
+        ))
+        for staff in members:
+            state.place(staff['name'], bucket)
+            if trace is not None:
+                trace.record(staff['name'], bucket, 'assigned', group_size=size)
+        placed.append(members)
+    return placed, unplaced
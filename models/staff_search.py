@@ -0,0 +1,144 @@
+import re
+from bisect import bisect_right
+
+# 单元格之间、行之间的分隔符，查询词中不会出现，保证匹配不跨单元格
+CELL_SEPARATOR = '\x1f'
+ROW_SEPARATOR = '\n'
+
+
+class StaffSearchIndex:
+    """
+    员工表搜索索引：每行预先转为小写并拼接成一段文本，所有行再连接为一个大字符串，
+    查询时用 C 实现的正则扫描代替逐行逐列比较，再按行起始位置二分定位行号。
+
+    查询语法：空格分隔的多个词，需全部命中；"字段:值" 只在该字段中匹配，
+    字段可写键名（team_name）、显示名（队名）或键名的唯一前缀（team）。
+    输入在上一次查询后继续追加字符时，只在上一次的结果中过滤
+    """
+
+    def __init__(self, store, columns):
+        self.store = store
+        self.columns = columns
+        self.fields = {}
+        for column_config in columns:
+            self.fields[column_config['key'].lower()] = column_config['key']
+            self.fields[column_config['display'].lower()] = column_config['key']
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        行数变化或整体替换数据后调用，下一次查询时重建索引
+        """
+        self.row_texts = None
+        self.haystacks = {}
+        self.last_query = None
+        self.last_rows = None
+
+    def set_store(self, store):
+        self.store = store
+        self.invalidate()
+
+    def update_row(self, row, key=None):
+        """
+        单元格修改后更新该行的文本；key 为修改的字段，None 表示整行
+        """
+        if self.row_texts is not None:
+            self.row_texts[row] = self._row_text(row)
+        self.haystacks.pop(None, None)
+        if key is None:
+            self.haystacks.clear()
+        else:
+            self.haystacks.pop(key, None)
+        self.last_query = None
+        self.last_rows = None
+
+    def _row_text(self, row):
+        return CELL_SEPARATOR.join(self.store.value(row, key) for key in self.store.keys).lower()
+
+    def _texts(self):
+        if self.row_texts is None:
+            columns = [self.store.column(key) for key in self.store.keys]
+            self.row_texts = [CELL_SEPARATOR.join(values).lower() for values in zip(*columns)]
+        return self.row_texts
+
+    def _haystack(self, key):
+        """
+        返回 (拼接后的文本, 每行起始位置)；key 为 None 时为整行文本，否则为单个字段
+        """
+        haystack = self.haystacks.get(key)
+        if haystack is None:
+            texts = self._texts() if key is None else [value.lower() for value in self.store.column(key)]
+            starts = []
+            position = 0
+            for text in texts:
+                starts.append(position)
+                position += len(text) + 1
+            haystack = (ROW_SEPARATOR.join(texts), starts)
+            self.haystacks[key] = haystack
+        return haystack
+
+    def resolve_field(self, name):
+        name = name.lower()
+        if name in self.fields:
+            return self.fields[name]
+        matches = {key for alias, key in self.fields.items() if alias.startswith(name)}
+        if len(matches) == 1:
+            return matches.pop()
+        return None
+
+    def parse(self, query):
+        """
+        解析查询为 [(字段键或 None, 小写的查询词), ...]；无法识别的字段按普通文本匹配
+        """
+        terms = []
+        for word in query.lower().split():
+            key = None
+            field, sep, value = word.partition(':')
+            if sep and field and value:
+                key = self.resolve_field(field)
+                if key is not None:
+                    word = value
+            terms.append((key, word))
+        return terms
+
+    def _scan(self, key, word):
+        text, starts = self._haystack(key)
+        rows = set()
+        for match in re.finditer(re.escape(word), text):
+            rows.add(bisect_right(starts, match.start()) - 1)
+        return rows
+
+    def _filter(self, rows, key, word):
+        if key is None:
+            texts = self._texts()
+            return {row for row in rows if word in texts[row]}
+        value = self.store.value
+        return {row for row in rows if word in value(row, key).lower()}
+
+    def search(self, query):
+        """
+        返回命中的行号集合；查询为空时返回 None，表示显示全部行
+        """
+        terms = self.parse(query)
+        if not terms:
+            return None
+
+        previous = self.parse(self.last_query) if self.last_query is not None else None
+        refine = (previous is not None and len(previous) == len(terms)
+                  and all(old_key == key and old_word in word
+                          for (old_key, old_word), (key, word) in zip(previous, terms)))
+
+        rows = None
+        for key, word in terms:
+            if refine:
+                rows = self._filter(self.last_rows if rows is None else rows, key, word)
+            elif rows is None:
+                rows = self._scan(key, word)
+            else:
+                rows = self._filter(rows, key, word)
+            if not rows:
+                break
+
+        self.last_query = query
+        self.last_rows = rows
+        return rows
@@ -0,0 +1,190 @@
+from array import array
+
+# 下拉列编码数组的类型码：无符号 16 位，每列最多 65536 种取值
+CODE_TYPECODE = 'H'
+
+
+class StaffStore:
+    """
+    按列存储的员工数据，行号即员工编号。
+    普通列每列一个字符串列表；下拉列（select，如出勤、队名、固定区域、擅长区域、擅长环节）
+    存为整数编码数组，categories[key] 为编码对应的取值，每种取值只保存一份字符串。
+    不依赖 Qt，表格模型、导入导出、校验和排班都可以直接读取
+    """
+
+    def __init__(self, columns, records=None):
+        self.keys = [column_config['key'] for column_config in columns]
+        self.defaults = {column_config['key']: column_config.get('default', '') for column_config in columns}
+        # 下拉列：编码 -> 取值，取值 -> 编码（只追加，已有编码不会改变）
+        self.categories = {column_config['key']: [] for column_config in columns if column_config.get('type') == 'select'}
+        self.category_codes = {key: {} for key in self.categories}
+        self.data = {key: array(CODE_TYPECODE) if key in self.categories else [] for key in self.keys}
+        if records:
+            self.extend(records)
+
+    @classmethod
+    def from_columns(cls, columns, data):
+        """
+        直接由列数据 {key: [值, ...]} 构建（如人员表快照），不经过逐行字典
+        """
+        store = cls(columns)
+        length = max((len(values) for values in data.values()), default=0)
+        for key in store.keys:
+            values = data.get(key)
+            if values is None:
+                values = [store._normalize(key, None)] * length
+            if key in store.categories:
+                store.data[key] = array(CODE_TYPECODE, map(store._encoder(key), values))
+            else:
+                store.data[key] = list(values)
+        return store
+
+    def copy(self):
+        """
+        复制一份独立的快照（编码数组按内存整体复制），供后台线程排班使用
+        """
+        store = StaffStore.__new__(StaffStore)
+        store.keys = list(self.keys)
+        store.defaults = dict(self.defaults)
+        store.categories = {key: list(values) for key, values in self.categories.items()}
+        store.category_codes = {key: dict(codes) for key, codes in self.category_codes.items()}
+        store.data = {key: values[:] for key, values in self.data.items()}
+        return store
+
+    def __len__(self):
+        return len(self.data[self.keys[0]]) if self.keys else 0
+
+    def _normalize(self, key, value):
+        if value is None:
+            value = self.defaults.get(key)
+        return '' if value is None else str(value)
+
+    def _encoder(self, key):
+        """
+        返回把取值转换为编码的函数，新取值追加到 categories 末尾
+        """
+        categories = self.categories[key]
+        codes = self.category_codes[key]
+
+        def encode(text):
+            code = codes.get(text)
+            if code is None:
+                code = codes[text] = len(categories)
+                categories.append(text)
+            return code
+        return encode
+
+    def _stored(self, key, value):
+        text = self._normalize(key, value)
+        if key in self.categories:
+            return self._encoder(key)(text)
+        return text
+
+    def code_of(self, key, value):
+        """
+        下拉列取值对应的编码，该列没有这个取值时返回 None
+        """
+        return self.category_codes[key].get(value)
+
+    def codes(self, key):
+        return self.data[key]
+
+    def column(self, key):
+        values = self.data[key]
+        if key in self.categories:
+            categories = self.categories[key]
+            return [categories[code] for code in values]
+        return values
+
+    def value(self, row, key):
+        if key in self.categories:
+            return self.categories[key][self.data[key][row]]
+        return self.data[key][row]
+
+    def set_value(self, row, key, value):
+        """
+        修改单元格，返回值是否发生变化
+        """
+        stored = self._stored(key, value)
+        values = self.data[key]
+        if values[row] == stored:
+            return False
+        values[row] = stored
+        return True
+
+    def extend(self, records):
+        for key in self.keys:
+            default = self.defaults.get(key)
+            values = (self._normalize(key, record.get(key, default)) for record in records)
+            if key in self.categories:
+                values = map(self._encoder(key), values)
+            self.data[key].extend(values)
+
+    def append(self, record):
+        self.extend([record])
+
+    def insert(self, row, record):
+        self.insert_records(row, [record])
+
+    def insert_records(self, row, records):
+        """
+        在 row 之前插入多行，每列只做一次切片赋值
+        """
+        for key in self.keys:
+            default = self.defaults.get(key)
+            values = [self._normalize(key, record.get(key, default)) for record in records]
+            if key in self.categories:
+                values = array(CODE_TYPECODE, map(self._encoder(key), values))
+            self.data[key][row:row] = values
+
+    def remove_range(self, first, last):
+        # 删除 first 到 last（包含）的行
+        for values in self.data.values():
+            del values[first:last + 1]
+
+    def remove_rows(self, rows):
+        """
+        一次遍历删除任意多行（行号可以不连续），每列只重建一次
+        """
+        removed = set(rows)
+        for key in self.keys:
+            kept = [value for row, value in enumerate(self.data[key]) if row not in removed]
+            self.data[key] = array(CODE_TYPECODE, kept) if key in self.categories else kept
+
+    def clear(self):
+        for key in self.keys:
+            del self.data[key][:]
+
+    def rows_where(self, key, value):
+        """
+        下拉列等于 value 的行号列表，按编码比较整数
+        """
+        code = self.code_of(key, value)
+        if code is None:
+            return []
+        return [row for row, row_code in enumerate(self.data[key]) if row_code == code]
+
+    def record(self, row):
+        return {key: self.value(row, key) for key in self.keys}
+
+    def records(self, rows):
+        """
+        指定行转换为员工字典列表
+        """
+        return [self.record(row) for row in rows]
+
+    def to_columns(self):
+        """
+        解码后的列数据 {key: [值, ...]}，供写出 Excel 使用
+        """
+        return {key: self.column(key) for key in self.keys}
+
+    def iter_rows(self):
+        # 按 keys 顺序逐行给出取值元组
+        return zip(*(self.column(key) for key in self.keys))
+
+    def to_records(self):
+        """
+        转换为员工字典列表
+        """
+        return [dict(zip(self.keys, values)) for values in self.iter_rows()]
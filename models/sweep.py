@@ -0,0 +1,70 @@
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from models.scheduler import Scheduler
+from utils.area_config_loader import area_config_values
+
+# 参与组合的四个岗位人数
+SWEEP_KEYS = ('Inbound_Front', 'Inbound_back', 'Outbound_Front', 'Outbound_back')
+
+# 子进程中复用的员工名单和配置，由 _init_worker 设置，避免每个组合都重新传输
+_worker_context = {}
+
+
+def _init_worker(staff_list, config, solver, repair_budget):
+    logging.disable(logging.CRITICAL)
+    _worker_context.update(
+        staff_list=staff_list,
+        config=config,
+        solver=solver,
+        repair_budget=repair_budget,
+    )
+
+
+def _evaluate(combination):
+    overrides = dict(zip(SWEEP_KEYS, combination))
+    area_config = area_config_values(_worker_context['config'], overrides)
+    scheduler = Scheduler(
+        _worker_context['staff_list'],
+        area_config,
+        solver=_worker_context['solver'],
+        repair_budget=_worker_context['repair_budget'],
+    )
+    success, _ = scheduler.schedule()
+    if not success:
+        return None
+    return {
+        'area_config': {key: area_config[key] for key in SWEEP_KEYS + ('Inbound_total', 'Outbound_total')},
+        'score': scheduler.preference_score(),
+        'unused': (area_config['Inbound_total'] + area_config['Outbound_total']) - scheduler.state.total(),
+    }
+
+
+def sweep_area_configs(staff_list, config, ranges, solver='flow', repair_budget=0, processes=None):
+    """
+    用同一份员工名单，在进程池中评估四个岗位人数的所有组合。
+    config 为 AreaConfig.json 的内容（提供团队设置和合计公式），
+    ranges 为 {岗位键: 可迭代的人数取值}，未给出的键沿用 config 中的默认值。
+
+    返回可行的组合列表，按偏好满足度从高到低排序，满足度相同时空余岗位少的在前
+    """
+    defaults = area_config_values(config)
+    values = [list(ranges.get(key, [defaults[key]])) for key in SWEEP_KEYS]
+    combinations = list(itertools.product(*values))
+    if not combinations:
+        return []
+
+    processes = processes or os.cpu_count() or 1
+    # 每个进程分到若干批，减少进程间通信次数
+    chunksize = max(1, len(combinations) // (processes * 4))
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(staff_list, config, solver, repair_budget),
+    ) as pool:
+        results = [result for result in pool.map(_evaluate, combinations, chunksize=chunksize) if result]
+
+    results.sort(key=lambda result: (-result['score'], result['unused']))
+    return results
@@ -0,0 +1,46 @@
+import json
+from collections import deque
+from itertools import count
+
+
+class DecisionTrace:
+    """
+    排班决策记录：每条事件包含序号、员工、岗位、原因以及附加信息，
+    保存在定长环形缓冲区中，超出容量时丢弃最早的事件。
+
+    排班器只有在传入 trace 时才会构造事件，不记录时没有额外开销
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.events = deque(maxlen=capacity)
+        self.sequence = count()
+
+    def record(self, staff, bucket, reason, **details):
+        event = {'seq': next(self.sequence), 'staff': staff, 'bucket': bucket, 'reason': reason}
+        if details:
+            event.update(details)
+        self.events.append(event)
+
+    @property
+    def dropped(self):
+        # 因缓冲区已满而丢弃的事件数
+        recorded = self.events[-1]['seq'] + 1 if self.events else 0
+        return recorded - len(self.events)
+
+    def clear(self):
+        self.events.clear()
+        self.sequence = count()
+
+    def to_list(self):
+        return list(self.events)
+
+    def to_json(self, indent=None):
+        return json.dumps(
+            {'capacity': self.capacity, 'dropped': self.dropped, 'events': self.to_list()},
+            ensure_ascii=False, indent=indent,
+        )
+
+    def export_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json(indent=2))
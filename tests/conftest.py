@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# 界面测试不需要显示器；用户配置写到临时目录，不影响本机配置（须在导入 utils.config_service 之前设置）
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ['HOME'] = tempfile.mkdtemp(prefix='scheduling-tests-')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,33 @@
+import json
+import os
+import stat
+
+import pytest
+
+from utils import persistence
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason='文件权限位只在 POSIX 系统上有意义')
+
+
+def file_mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_atomic_write_keeps_existing_mode(tmp_path):
+    path = tmp_path / 'AreaConfig.json'
+    path.write_text('{}', encoding='utf-8')
+    os.chmod(path, 0o640)
+
+    persistence.atomic_write_json(str(path), {'Inbound_total': 5})
+
+    assert file_mode(path) == 0o640
+    assert json.loads(path.read_text(encoding='utf-8')) == {'Inbound_total': 5}
+
+
+def test_atomic_write_new_file_uses_umask(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, '_UMASK', 0o022)
+    path = tmp_path / 'staff_table_config.json'
+
+    persistence.atomic_write_json(str(path), {'columns': []})
+
+    assert file_mode(path) == 0o644
@@ -0,0 +1,34 @@
+import datetime
+
+import pandas as pd
+
+from utils.roster_loader import _RowConverter, records_from_frame
+
+COLUMNS = [
+    {'key': 'name', 'display': '姓名', 'type': 'text'},
+    {'key': 'Attendance', 'display': '出勤', 'type': 'select'},
+    {'key': 'Group_members', 'display': '组员', 'type': 'list', 'separators': [',', '、']},
+]
+
+ROWS = [
+    [1001, 'Y', '1002, 1003、 1004'],
+    [None, None, None],
+    ['NA', float('nan'), ' , '],
+    [1003.5, '', '、a,,b 、'],
+    ['', '', ''],
+    [datetime.datetime(2024, 1, 2), 'N', 7.0],
+]
+
+
+def test_records_from_frame_matches_row_converter():
+    header = [column['display'] for column in COLUMNS] + ['备注']
+    rows = [row + ['x'] for row in ROWS]
+    df = pd.DataFrame(rows, columns=header, dtype=object)
+
+    records = records_from_frame(df, COLUMNS)
+
+    assert records == list(_RowConverter(header, COLUMNS).records(rows))
+    assert records[0] == {'name': '1001', 'Attendance': 'Y', 'Group_members': '1002、1003、1004'}
+    assert records[1] == {'name': 'NA', 'Attendance': '', 'Group_members': ''}
+    assert records[2]['Group_members'] == 'a、b'
+    assert len(records) == 4
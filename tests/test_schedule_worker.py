@@ -0,0 +1,64 @@
+from benchmarks.roster_generator import generate_area_config, generate_roster, load_staff_config
+from models.scheduler import load_scheduler_text
+from ui.schedule_worker import ScheduleWorker
+from utils.area_config_loader import area_config_values
+
+
+def run_worker(staff, area_config, previous_scheduler=None, previous_staff=None, cancel_before=False, solver='greedy'):
+    # 在当前线程中直接执行，信号同步送达
+    worker = ScheduleWorker(staff, area_config, solver=solver,
+                            previous_scheduler=previous_scheduler, previous_staff=previous_staff)
+    events = []
+    worker.signals.finished.connect(lambda success, result, scheduler: events.append(('finished', success, scheduler)))
+    worker.signals.cancelled.connect(lambda: events.append(('cancelled',)))
+    if cancel_before:
+        worker.cancel()
+    worker.run()
+    return worker, events
+
+
+def ungrouped(staff_list, attendance):
+    return next(staff for staff in staff_list if staff['Attendance'] == attendance and not staff['fixed_area']
+                and not staff['Group_leader'] and not staff['Group_members'])
+
+
+def swap_attendance(staff_list):
+    # 一名出勤员工请假、一名未出勤员工到岗，出勤人数不变，增量排班需要安置到岗的员工
+    changed = [dict(staff) for staff in staff_list]
+    present, absent = ungrouped(changed, 'Y'), ungrouped(changed, 'N')
+    present['Attendance'], absent['Attendance'] = 'N', 'Y'
+    return changed
+
+
+def test_cancel_after_finish_does_not_stop_later_reschedules():
+    roster = generate_roster(2000, load_staff_config()['columns'], seed=3)
+    area_config = area_config_values(generate_area_config(roster, load_scheduler_text()))
+
+    _, events = run_worker(roster, area_config)
+    assert events[0][:2] == ('finished', True)
+    scheduler = events[0][2]
+
+    changed = swap_attendance(roster)
+    worker, events = run_worker(changed, area_config, scheduler, roster)
+    assert events == [('finished', True, scheduler)]
+    # 运行结束后才取消，不影响之后复用同一排班器
+    worker.cancel()
+
+    changed_again = swap_attendance(changed)
+    _, events = run_worker(changed_again, area_config, scheduler, changed)
+    assert events == [('finished', True, scheduler)]
+
+    _, events = run_worker(changed_again, area_config, scheduler, changed, cancel_before=True)
+    assert events == [('cancelled',)]
+
+
+def test_flow_solver_runs_a_full_schedule():
+    roster = generate_roster(2000, load_staff_config()['columns'], seed=3)
+    area_config = area_config_values(generate_area_config(roster, load_scheduler_text()))
+    _, events = run_worker(roster, area_config)
+    scheduler = events[0][2]
+
+    changed = swap_attendance(roster)
+    worker, events = run_worker(changed, area_config, scheduler, roster, solver='flow')
+    assert events == [('finished', True, worker.scheduler)]
+    assert worker.scheduler is not scheduler and worker.scheduler.solver == 'flow'
@@ -0,0 +1,35 @@
+import pytest
+
+from PyQt6.QtWidgets import QApplication
+
+from ui.staff_table import StaffTable, StaffTableModel
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def test_remove_rows_generator_on_reset_path(app):
+    table = StaffTable()
+    table.append_rows([{'name': f'员工{row}'} for row in range(1000)])
+    changes = []
+    table.rows_changed.connect(changes.append)
+
+    # 每隔一行删除，区间数超过 MAX_REMOVE_RANGES，走重置模型的分支
+    ranges = table.remove_rows(row for row in range(0, 1000, 2))
+
+    assert len(ranges) == 500 > StaffTableModel.MAX_REMOVE_RANGES
+    assert table.rowCount() == 500
+    assert table.store.column('name')[:3] == ['员工1', '员工3', '员工5']
+    assert changes and 'removed' in changes[-1]
+
+
+def test_remove_rows_generator_by_ranges(app):
+    table = StaffTable()
+    table.append_rows([{'name': f'员工{row}'} for row in range(10)])
+
+    ranges = table.remove_rows(row for row in (1, 2, 5))
+
+    assert ranges == [(1, 2), (5, 5)]
+    assert table.store.column('name') == ['员工0', '员工3', '员工4', '员工6', '员工7', '员工8', '员工9']
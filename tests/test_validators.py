@@ -0,0 +1,30 @@
+from models.scheduler import Scheduler
+from models.staff_store import StaffStore
+from utils.config_service import default_config_path, get_config
+from utils.vaildators import check_feasibility, validate_configuration
+
+AREA_CONFIG = {
+    'Inbound_team': '一队', 'Outbound_team': '二队', 'Mobile_team': '三队',
+    'Inbound_total': 5, 'Inbound_Front': 3, 'Inbound_back': 3,
+    'Outbound_total': 5, 'Outbound_Front': 3, 'Outbound_back': 3,
+}
+
+STAFF = [
+    {'name': '张三', 'Attendance': 'Y', 'fixed_area': '入境', 'team_name': '一队'},
+    {'name': '张三', 'Attendance': 'Y', 'fixed_area': '入境', 'team_name': '一队'},
+    {'name': '李四', 'Attendance': 'Y', 'fixed_area': '', 'team_name': '三队'},
+    # 未出勤的同名员工不算重复
+    {'name': '李四', 'Attendance': 'N', 'fixed_area': '', 'team_name': '三队'},
+]
+
+
+def test_duplicate_attending_names_are_reported():
+    columns = get_config(default_config_path('staff_table_config.json'))['columns']
+    for staff_list in (STAFF, StaffStore(columns, STAFF)):
+        report = check_feasibility(staff_list, AREA_CONFIG)
+        assert [violation['constraint'] for violation in report.violations] == ['duplicate_name']
+        assert report.violations[0]['staff'] == ['张三']
+
+    is_valid, message = validate_configuration(STAFF, AREA_CONFIG)
+    assert not is_valid and '张三' in message
+    assert Scheduler(STAFF, AREA_CONFIG).schedule() == (False, None)
@@ -0,0 +1,211 @@
+"""
+无界面批量排班入口，不导入任何 Qt 模块。
+
+用法：
+    python -m tools.batch_schedule schedule --area-config AreaConfig.json -o 输出目录 人员表1.xlsx 人员表2.xlsx ...
+    python -m tools.batch_schedule schedule --area-config AreaConfig.json --format csv --combined 汇总.xlsx 人员表目录
+    python -m tools.batch_schedule sweep --area-config AreaConfig.json --inbound-front 2:8 --outbound-back 1:6 人员表.xlsx
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+
+from models.scheduler import Scheduler
+from models.sweep import SWEEP_KEYS, sweep_area_configs
+from models.trace import DecisionTrace
+from utils import profiling
+from utils.area_config_loader import load_area_config
+from utils.config_service import get_config, get_config_copy
+from utils.result_writers import FORMATS, write_result as write_result_file, write_results
+from utils.roster_loader import load_roster
+from utils.vaildators import validate_configuration
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STAFF_CONFIG = os.path.join(PROJECT_DIR, 'json', 'staff_table_config.json')
+
+
+def expand_rosters(paths):
+    """
+    展开命令行给出的文件、目录和通配符，返回所有 .xlsx 人员表
+    """
+    rosters = []
+    for path in paths:
+        if os.path.isdir(path):
+            rosters.extend(sorted(glob.glob(os.path.join(path, '*.xlsx'))))
+        elif any(ch in path for ch in '*?['):
+            rosters.extend(sorted(glob.glob(path)))
+        else:
+            rosters.append(path)
+    # 跳过 Excel 打开文件时产生的临时文件
+    return [p for p in rosters if not os.path.basename(p).startswith('~$')]
+
+
+def schedule_roster(roster_path, columns, area_config, solver='greedy', repair_budget=0, trace=None):
+    """
+    对单个人员表排班，返回 (是否成功, 排班结果或错误信息)
+    """
+    staff_list = load_roster(roster_path, columns)
+    is_valid, validate_msg = validate_configuration(staff_list, area_config)
+    if not is_valid:
+        return False, validate_msg
+
+    scheduler = Scheduler(staff_list, area_config, solver=solver, repair_budget=repair_budget, trace=trace)
+    success, result = scheduler.schedule()
+    if not success:
+        return False, "无法满足所有条件"
+    return True, result
+
+
+def write_result(result, roster_path, output_dir, fmt='json'):
+    stem = os.path.splitext(os.path.basename(roster_path))[0]
+    output_path = os.path.join(output_dir, f"{stem}_排班结果.{fmt}")
+    if fmt == 'json':
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    else:
+        write_result_file(result, output_path, fmt)
+    return output_path
+
+
+def iter_scheduled(rosters, columns, area_config, args, failures):
+    """
+    逐个排班并写出单表结果，生成 (人员表名, 排班结果)；失败的人员表记入 failures。
+    汇总文件直接消费该生成器，所有结果在一次遍历中写出
+    """
+    for roster_path in rosters:
+        trace = DecisionTrace(args.trace_capacity) if args.trace else None
+        try:
+            success, result_or_message = schedule_roster(roster_path, columns, area_config, args.solver,
+                                                         args.repair_budget, trace)
+        except Exception as e:
+            success, result_or_message = False, f"处理过程中出现错误:{e}"
+
+        if trace is not None:
+            stem = os.path.splitext(os.path.basename(roster_path))[0]
+            trace.export_json(os.path.join(args.output_dir, f"{stem}_trace.json"))
+
+        if success:
+            output_path = write_result(result_or_message, roster_path, args.output_dir, args.format)
+            print(f"[成功] {roster_path} -> {output_path}")
+            yield os.path.basename(roster_path), result_or_message
+        else:
+            failures.append(roster_path)
+            print(f"[失败] {roster_path}: {result_or_message}", file=sys.stderr)
+
+
+def run_schedule(args):
+    columns = get_config(args.staff_config)['columns']
+    area_config = load_area_config(args.area_config)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    rosters = expand_rosters(args.rosters)
+    if not rosters:
+        print("没有找到需要排班的人员表", file=sys.stderr)
+        return 2
+
+    failures = []
+    results = iter_scheduled(rosters, columns, area_config, args, failures)
+    if args.combined:
+        rows = write_results(results, args.combined)
+        print(f"汇总结果共 {rows} 行，已写入 {args.combined}")
+    else:
+        for _ in results:
+            pass
+
+    print(f"共处理 {len(rosters)} 个人员表，成功 {len(rosters) - len(failures)} 个，失败 {len(failures)} 个")
+    return 1 if failures else 0
+
+
+def parse_range(text):
+    """
+    解析人数范围：'5' 或 '起始:结束[:步长]'（包含结束值）
+    """
+    parts = [int(part) for part in text.split(':')]
+    if len(parts) == 1:
+        return [parts[0]]
+    if len(parts) in (2, 3):
+        step = parts[2] if len(parts) == 3 else 1
+        return list(range(parts[0], parts[1] + 1, step))
+    raise argparse.ArgumentTypeError(f"无效的人数范围：{text}")
+
+
+def run_sweep(args):
+    columns = get_config(args.staff_config)['columns']
+    # 需要传给子进程，使用普通字典
+    config = get_config_copy(args.area_config)
+    staff_list = load_roster(args.roster, columns)
+
+    ranges = {key: getattr(args, key.lower()) for key in SWEEP_KEYS if getattr(args, key.lower()) is not None}
+    results = sweep_area_configs(staff_list, config, ranges, solver=args.solver,
+                                 repair_budget=args.repair_budget, processes=args.processes)
+    if args.top:
+        results = results[:args.top]
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"共找到 {len(results)} 个可行配置，已写入 {args.output}")
+    else:
+        print(output)
+    return 0 if results else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="自动排班系统批量排班（无界面）")
+    parser.add_argument('-v', '--verbose', action='store_true', help="输出排班过程日志")
+    parser.add_argument('--timings', action='store_true', help="结束后输出各环节耗时汇总（JSON）")
+    parser.add_argument('--cprofile', metavar='PATH', help="开启 cProfile 并把调用栈数据保存到 PATH")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    schedule_parser = subparsers.add_parser('schedule', help="对一个或多个人员表排班")
+    schedule_parser.add_argument('rosters', nargs='+', help="人员表 Excel 文件、目录或通配符")
+    schedule_parser.add_argument('--area-config', required=True, help="AreaConfig.json 路径")
+    schedule_parser.add_argument('--staff-config', default=DEFAULT_STAFF_CONFIG, help="staff_table_config.json 路径")
+    schedule_parser.add_argument('-o', '--output-dir', default='.', help="排班结果输出目录")
+    schedule_parser.add_argument('--format', choices=['json'] + sorted(set(FORMATS.values())), default='json',
+                                 help="每个人员表的结果格式")
+    schedule_parser.add_argument('--combined', metavar='PATH',
+                                 help="把所有成功的排班结果写入同一个文件（.xlsx/.csv/.jsonl，含来源列）")
+    schedule_parser.add_argument('--solver', choices=Scheduler.SOLVERS, default='greedy', help="排班算法")
+    schedule_parser.add_argument('--repair-budget', type=int, default=Scheduler.DEFAULT_REPAIR_BUDGET,
+                                 help="贪心分配卡住时的局部修复步数上限，0 表示不修复")
+    schedule_parser.add_argument('--trace', action='store_true', help="记录排班决策并输出 <人员表>_trace.json")
+    schedule_parser.add_argument('--trace-capacity', type=int, default=10000, help="每个人员表最多保留的决策事件数")
+    schedule_parser.set_defaults(func=run_schedule)
+
+    sweep_parser = subparsers.add_parser('sweep', help="枚举岗位人数组合，按偏好满足度排序可行配置")
+    sweep_parser.add_argument('roster', help="人员表 Excel 文件")
+    sweep_parser.add_argument('--area-config', required=True, help="AreaConfig.json 路径")
+    sweep_parser.add_argument('--staff-config', default=DEFAULT_STAFF_CONFIG, help="staff_table_config.json 路径")
+    for key in SWEEP_KEYS:
+        option = '--' + key.lower().replace('_', '-')
+        sweep_parser.add_argument(option, dest=key.lower(), type=parse_range, help=f"{key} 的取值范围，如 2:8 或 0:20:2")
+    sweep_parser.add_argument('--solver', choices=Scheduler.SOLVERS, default='flow', help="排班算法")
+    sweep_parser.add_argument('--repair-budget', type=int, default=0, help="贪心算法的局部修复步数上限")
+    sweep_parser.add_argument('--processes', type=int, default=None, help="进程数，默认使用全部 CPU")
+    sweep_parser.add_argument('--top', type=int, default=20, help="只输出前 N 个配置，0 表示全部")
+    sweep_parser.add_argument('-o', '--output', help="结果 JSON 文件路径，默认输出到终端")
+    sweep_parser.set_defaults(func=run_sweep)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    if args.cprofile:
+        profiling.start_cprofile()
+    try:
+        return args.func(args)
+    finally:
+        if args.cprofile:
+            print(profiling.stop_cprofile(args.cprofile), file=sys.stderr)
+        if args.timings:
+            print(profiling.report_json(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
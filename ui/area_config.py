@@ -1,9 +1,7 @@
-import json
-import os
-import sys
-from PyQt6.QtWidgets import QApplication, QWidget, QGridLayout, QSpinBox, QLabel, QHBoxLayout, QComboBox
-import shutil
-import pkgutil
+from PyQt6.QtWidgets import QWidget, QGridLayout, QSpinBox, QLabel, QHBoxLayout, QComboBox
+from utils.config_service import get_config_copy, get_config_path
+from utils.formula_engine import FormulaError, engine_for
+from utils.persistence import DebouncedJsonWriter
 
 
 class AreaConfig(QWidget):
@@ -11,61 +9,38 @@ class AreaConfig(QWidget):
         super().__init__()
         self.config_file = self.get_config_path()
         self.config = self.load_config()
+        # 调整人数时频繁触发保存，合并为停止修改后的一次原子写入
+        self.config_writer = DebouncedJsonWriter(self.config_file, indent=2)
 
         self.grid_layout = QGridLayout(self)
         self.grid_layout.setContentsMargins(10,10, 10,10)
         self.grid_layout.setSpacing(10)
 
         self.ui_elements = {}
+        # 各数字控件的当前值，供合计公式使用
+        self.values = {}
+        try:
+            self.formula_engine = engine_for(self.config)
+        except FormulaError as e:
+            print(f"合计公式无效：{e}")
+            self.formula_engine = None
         self.create_ui()
 
         self.update_totals()
     
-    def resource_path(self,relative_path):
-        """
-        在打包和开发环境中获取资源文件的正确路径
-        """
-        if getattr(sys, 'frozen', False):
-            return os.path.join(sys._MEIPASS, relative_path)
-        else:
-            return os.path.join(os.path.abspath("."), relative_path)
-
     def get_config_path(self):
-        user_data_dir = os.path.join(os.path.expanduser('~'), 'SchedulingSystemConfig')
-        os.makedirs(user_data_dir, exist_ok=True)
-        config_path = os.path.join(user_data_dir, 'AreaConfig.json')
-
-        if not os.path.exists(config_path):
-            if getattr(sys, 'frozen', False):
-                # 如果是打包后的环境，从 sys._MEIPASS 目录获取资源
-                default_path = self.resource_path(os.path.join('json', 'AreaConfig.json'))
-                if os.path.exists(default_path):
-                    with open(default_path, 'rb') as src, open(config_path, 'wb') as dst:
-                        dst.write(src.read())
-                else:
-                    raise FileNotFoundError(f"无法找到打包环境下的默认配置文件: {default_path}")
-            else:
-                # 开发环境，直接从项目目录获取
-                default_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'json', 'AreaConfig.json')
-                if os.path.exists(default_path):
-                    shutil.copy(default_path, config_path)
-                else:
-                    raise FileNotFoundError(f"默认配置文件不存在: {default_path}")
-
-        return config_path  # 确保在所有情况下都返回 config_path
+        return get_config_path('AreaConfig.json')
     
     def load_config(self):
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # 界面会修改并保存配置，使用可修改的副本
+            return get_config_copy(self.config_file)
         except FileNotFoundError:
             print(f"配置文件 {self.config_file}未找到。使用默认配置。")
             return {"uiControls":[], "calculations":[]}
 
     def save_config(self):
-        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
+        self.config_writer.schedule(self.config)
 
     def create_ui(self):
         for control in self.config['uiControls']:
@@ -90,8 +65,10 @@ class AreaConfig(QWidget):
                 control['row'], control['col']
             )
 
-            if control['type'] == 'number' and not control.get('readonly', False):
-                element.valueChanged.connect(self.update_totals)
+            if control['type'] == 'number':
+                self.values[control['key']] = element.value()
+                if not control.get('readonly', False):
+                    element.valueChanged.connect(lambda value, key=control['key']: self.update_totals(key, value))
 
     def create_spinbox(self, default, minimum, maximum, readonly=False):
         spinbox = QSpinBox()
@@ -115,16 +92,27 @@ class AreaConfig(QWidget):
         layout.addStretch()
         return layout
     
-    def update_totals(self):
-        for calc in self.config.get('calculations',[]):
-            target = calc['target']
-            formula = calc['formula']
+    def update_totals(self, changed_key=None, value=None):
+        """
+        changed_key 的值变化后只重算依赖它的合计项；changed_key 为 None 时重算全部
+        """
+        if changed_key is not None:
+            self.values[changed_key] = value
+        if self.formula_engine is not None:
             try:
-                result = eval(formula, {}, {k: v.value() for k, v in self.ui_elements.items() if isinstance(v, QSpinBox)})
-                self.ui_elements[target].setValue(int(result))
-            except Exception as e:
-                print(f"计算{target}时出错：{e}")
+                self.formula_engine.recompute(
+                    self.values, None if changed_key is None else [changed_key], self.show_total)
+            except (FormulaError, ArithmeticError, TypeError) as e:
+                print(f"计算合计项时出错：{e}")
         self.save_config()
+
+    def show_total(self, target, value):
+        element = self.ui_elements.get(target)
+        if not isinstance(element, QSpinBox):
+            return value
+        element.setValue(value)
+        # 控件范围可能截断结果，后续合计项以显示值为准
+        return element.value()
                       
     def update_config(self, key, value):
         for control in self.config['uiControls']:
@@ -0,0 +1,87 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from utils.profiling import count, profile_thread, span
+from utils.roster_cache import load_snapshot, save_snapshot, snapshot_key
+from utils.roster_loader import iter_roster_chunks, load_roster
+
+
+class RosterImportSignals(QObject):
+    # 估计的总行数，未知时为 0
+    total = pyqtSignal(int)
+    # 一批已转换的员工字典
+    chunk = pyqtSignal(object)
+    # 命中快照时一次性给出全部列数据 {key: [值, ...]}
+    snapshot = pyqtSignal(object)
+    # 导入的行数, 是否被取消
+    finished = pyqtSignal(int, bool)
+    error = pyqtSignal(str)
+
+
+class RosterImportWorker(QRunnable):
+    """
+    在线程池中读取人员表，每读出 chunk_size 行就通过 chunk 信号交给界面线程追加到表格。
+    .xlsx 使用只读流式读取；其他格式（.xls）先整体读取再分批发送。
+    use_cache 为 True 时先查人员表快照，命中则直接发送 snapshot；完整读取后保存快照
+    """
+
+    # 每批发送的行数，兼顾界面刷新频率和信号开销
+    CHUNK_SIZE = 2000
+
+    def __init__(self, file_name, columns, chunk_size=CHUNK_SIZE, use_cache=True):
+        super().__init__()
+        self.file_name = file_name
+        self.columns = columns
+        self.chunk_size = chunk_size
+        self.use_cache = use_cache
+        self.cancelled = False
+        self.signals = RosterImportSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def iter_chunks(self):
+        if self.file_name.lower().endswith('.xlsx'):
+            yield from iter_roster_chunks(self.file_name, self.columns, self.chunk_size,
+                                          size_hint=lambda rows: self.signals.total.emit(rows or 0))
+            return
+        staff_data = load_roster(self.file_name, self.columns)
+        self.signals.total.emit(len(staff_data))
+        for start in range(0, len(staff_data), self.chunk_size):
+            yield staff_data[start:start + self.chunk_size]
+
+    def run(self):
+        # 开启 SCHEDULING_PROFILE 时，线程池中的读取也计入 cProfile 结果
+        with profile_thread(), span('excel.import_staff'):
+            self.run_import()
+
+    def run_import(self):
+        imported = 0
+        try:
+            if self.use_cache:
+                data = load_snapshot(self.file_name, self.columns)
+                if data is not None:
+                    imported = len(next(iter(data.values()), []))
+                    self.signals.total.emit(imported)
+                    self.signals.snapshot.emit(data)
+                    count('excel.imported_rows', imported)
+                    self.signals.finished.emit(imported, False)
+                    return
+                key = snapshot_key(self.file_name, self.columns)
+                keys = [col['key'] for col in self.columns]
+                collected = {k: [] for k in keys}
+
+            for chunk in self.iter_chunks():
+                if self.cancelled:
+                    break
+                self.signals.chunk.emit(chunk)
+                imported += len(chunk)
+                if self.use_cache:
+                    for k in keys:
+                        collected[k].extend(staff[k] for staff in chunk)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        if self.use_cache and not self.cancelled:
+            save_snapshot(self.file_name, self.columns, collected, key)
+        count('excel.imported_rows', imported)
+        self.signals.finished.emit(imported, self.cancelled)
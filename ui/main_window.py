@@ -1,18 +1,20 @@
 from PyQt6.QtWidgets import (QMainWindow, QVBoxLayout, QPushButton, QWidget, QMessageBox, QToolBar,
                             QTableWidget, QTableWidgetItem, QHBoxLayout, QStackedWidget, QLineEdit,
-                            QScrollArea, QApplication, QHeaderView,QFileDialog)
+                            QScrollArea, QApplication, QHeaderView,QFileDialog, QProgressDialog, QProgressBar)
 
 from PyQt6.QtGui import QAction, QIcon
-from PyQt6.QtCore import Qt, pyqtSignal, QRect
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QThreadPool
 from ui.staff_table import StaffTable
 from ui.area_config import AreaConfig
-from models.scheduler import Scheduler
-from utils.excel_handler import ExcelHandler
-from utils.vaildators import validate_configuration
+from ui.schedule_worker import ScheduleWorker
+from utils.profiling import timed
 
 class StaffTableWithSearch(QWidget):
     StaffTableWithSearch_data_changed = pyqtSignal()
 
+    # 停止输入多久后执行搜索（毫秒）
+    SEARCH_DELAY_MS = 200
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_layout = QVBoxLayout(self)
@@ -22,8 +24,14 @@ class StaffTableWithSearch(QWidget):
 
         # 添加搜索栏
         self.search_bar = QLineEdit()
-        self.search_bar.setPlaceholderText("搜索员工...")
-        self.search_bar. textChanged.connect(self.search_staff)
+        self.search_bar.setPlaceholderText("搜索员工...（可按字段搜索，如 队名:二队）")
+        self.search_bar. textChanged.connect(self.schedule_search)
+
+        # 连续输入时只在停顿后搜索一次
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(lambda: self.search_staff(self.search_bar.text()))
 
         # 添加导入导出按钮
         self.default_import_button = QPushButton("默认导入路径")
@@ -40,20 +48,45 @@ class StaffTableWithSearch(QWidget):
         #创建员工表格
         self.staff_table = StaffTable()
         self.staff_table.staff_data_changed.connect(self.on_staff_data_changed)
+
+        # 后台导入进度，只在导入时显示
+        import_layout = QHBoxLayout()
+        self.import_progress = QProgressBar()
+        self.import_progress.setFormat("正在导入 %v / %m")
+        self.cancel_import_button = QPushButton("取消导入")
+        self.cancel_import_button.clicked.connect(self.staff_table.cancel_import)
+        import_layout.addWidget(self.import_progress)
+        import_layout.addWidget(self.cancel_import_button)
+        self.staff_table.import_progress.connect(self.on_import_progress)
+        self.staff_table.import_finished.connect(lambda rows, cancelled: self.show_import_progress(False))
+        self.staff_table.import_failed.connect(lambda message: self.show_import_progress(False))
+        self.show_import_progress(self.staff_table.importing)
         
         #将顶部布局和表格添加到主布局
         self.main_layout.addLayout(top_layout)
+        self.main_layout.addLayout(import_layout)
         self.main_layout.addWidget(self.staff_table)
         
+    def schedule_search(self, text):
+        self.search_timer.start()
+
     def search_staff(self, text):
-        for row in range(self.staff_table.rowCount()):
-            match = False
-            for col in range(self.staff_table.columnCount()):
-                item = self.staff_table.item(row, col)
-                if item and text.lower() in item.text().lower():
-                    match = True
-                    break
-            self.staff_table.setRowHidden(row, not match)
+        self.search_timer.stop()
+        self.staff_table.apply_search(text)
+
+    def show_import_progress(self, visible):
+        if visible:
+            # 总行数未知时显示忙碌状态
+            self.import_progress.setRange(0, 0)
+        self.import_progress.setVisible(visible)
+        self.cancel_import_button.setVisible(visible)
+
+    def on_import_progress(self, done, total):
+        if not self.import_progress.isVisible():
+            self.show_import_progress(True)
+        if total > 0:
+            self.import_progress.setRange(0, max(total, done))
+            self.import_progress.setValue(done)
 
     def on_staff_data_changed(self):
         self.StaffTableWithSearch_data_changed.emit()
@@ -66,6 +99,9 @@ class StaffTableWithSearch(QWidget):
 
     def get_staff(self):
         return self.staff_table.get_staff_data()
+
+    def get_staff_store(self):
+        return self.staff_table.get_staff_store()
     
     def default_import_staff(self):
         options = QFileDialog.Option.DontUseNativeDialog
@@ -103,14 +139,19 @@ class ScheduleResultwidget(QWidget):
         self.result_table = QTableWidget()
         self.content_layout.addWidget(self.result_table)
 
+        # 最近一次显示的排班结果，用于导出
+        self.result = None
+
         self.scroll_area.setWidget(self.content_widget)
 
         self.main_layout.addWidget(self.scroll_area)
 
+    @timed('result_widget.display_result')
     def display_result(self, result):
         if not isinstance(result, dict):
             QMessageBox.warning(self,"错误","排班结果格式不正确")
             return
+        self.result = result
         
         areas = list(result.keys())
 
@@ -145,8 +186,12 @@ class ScheduleResultwidget(QWidget):
         self.result_table.viewport().update()
 
 class MainWindow(QMainWindow):
+    # 窗口首次显示并完成绘制后发出
+    first_painted = pyqtSignal()
+
     def __init__(self):
         super().__init__()
+        self.first_shown = False
         self.setWindowTitle("自动排班系统")
         screen = QApplication.primaryScreen()
         available_geometry = screen.availableGeometry()
@@ -188,6 +233,14 @@ class MainWindow(QMainWindow):
         self.main_layout.addWidget(self.left_widget)
 
         self.schedule_result_widget = ScheduleResultwidget(self)
+
+        # 上一次成功排班的排班器和员工快照，用于少量人员或容量变化时增量排班
+        self.last_scheduler = None
+        self.last_staff_snapshot = None
+        # 正在后台执行的排班任务及其进度对话框
+        self.schedule_worker = None
+        self.schedule_progress = None
+        self.pending_staff = None
         self.schedule_result_widget.export_button.clicked.connect(self.export_result)
 
         self.central_widget.addWidget(self.main_widget)
@@ -195,7 +248,7 @@ class MainWindow(QMainWindow):
 
         self.add_row_button.clicked.connect(self.staff_table_with_search.add_empty_row)
         self.remove_row_button.clicked.connect(self.staff_table_with_search. remove_selected_rows)
-        self.schedule_button.clicked.connect(self.start_scheduling)
+        self.schedule_button.clicked.connect(lambda: self.start_scheduling())
         self.staff_table_with_search.StaffTableWithSearch_data_changed.connect(self.on_staff_data_changed)
 
         self.staff_table_with_search.default_import_button.clicked.connect(self.staff_table_with_search.default_import_staff)
@@ -216,33 +269,118 @@ class MainWindow(QMainWindow):
         toolbar.addAction(home_action)
         toolbar.addAction(view_result_action)
     
-    def start_scheduling(self):
-        # 调用校验方法，假设它返回一个元组 (is_valid, message)
-        is_valid, validate_msg = validate_configuration(self.staff_table_with_search.get_staff(), self.area_config.get_config())
-        if not is_valid:
-            QMessageBox.warning(self, "配置校验失败", validate_msg)
+    # 进度对话框中各排班阶段的说明
+    SCHEDULE_STAGES = {
+        'validate': "正在校验配置...",
+        'feasibility': "正在检查容量...",
+        'fixed_area': "正在分配固定区域员工...",
+        'groups': "正在分配组...",
+        'remainder': "正在分配其余员工...",
+        'flow': "正在求解最优分配...",
+        'reschedule': "正在增量调整...",
+    }
+
+    def start_scheduling(self, solver='greedy'):
+        if self.schedule_worker is not None:
             return
-        
-        scheduler = Scheduler(self.staff_table_with_search.get_staff(), self.area_config.get_config())
-        success, result_or_message = scheduler.schedule()
+
+        # 在界面线程中取得员工和区域配置的快照，排班在后台线程中进行
+        staff = self.staff_table_with_search.get_staff_store()
+        area_config = self.area_config.get_config()
+        self.pending_staff = staff
+
+        # 团队设置未变时，在上一次结果上只调整变化的员工和超出新容量的员工
+        previous = None
+        if self.last_scheduler is not None and self.last_scheduler.teams_match(area_config):
+            previous = self.last_scheduler
+
+        worker = ScheduleWorker(staff, area_config, solver=solver,
+                                previous_scheduler=previous, previous_staff=self.last_staff_snapshot)
+        worker.signals.progress.connect(self.on_schedule_progress)
+        worker.signals.invalid.connect(self.on_schedule_invalid)
+        worker.signals.finished.connect(self.on_schedule_finished)
+        worker.signals.cancelled.connect(self.on_schedule_cancelled)
+        worker.signals.error.connect(self.on_schedule_error)
+
+        self.schedule_progress = QProgressDialog("正在排班...", "取消", 0, 0, self)
+        self.schedule_progress.setWindowTitle("排班")
+        self.schedule_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.schedule_progress.setMinimumDuration(300)
+        self.schedule_progress.canceled.connect(worker.cancel)
+
+        self.schedule_worker = worker
+        self.schedule_button.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+
+    def on_schedule_progress(self, stage, done, total):
+        if self.schedule_progress is None:
+            return
+        self.schedule_progress.setLabelText(self.SCHEDULE_STAGES.get(stage, "正在排班..."))
+        self.schedule_progress.setMaximum(max(total, 1))
+        self.schedule_progress.setValue(min(done, max(total, 1)))
+
+    def finish_scheduling(self):
+        self.schedule_worker = None
+        self.schedule_button.setEnabled(True)
+        if self.schedule_progress is not None:
+            self.schedule_progress.canceled.disconnect()
+            self.schedule_progress.close()
+            self.schedule_progress = None
+
+    def on_schedule_invalid(self, validate_msg):
+        self.finish_scheduling()
+        QMessageBox.warning(self, "配置校验失败", validate_msg)
+
+    def on_schedule_finished(self, success, result_or_message, scheduler):
+        self.finish_scheduling()
         if success:
+            self.last_scheduler = scheduler
+            self.last_staff_snapshot = self.pending_staff
             QMessageBox.information(self, "排班成功", "排班已完成,结果已显示")
             self.schedule_result_widget.display_result(result_or_message)
             self.central_widget.setCurrentWidget(self.schedule_result_widget)
         else:
+            self.last_scheduler = None
             QMessageBox.warning(self, "排班失败", f"无法满足所有条件：{result_or_message}")
 
+    def on_schedule_cancelled(self):
+        self.finish_scheduling()
+        # 被取消的增量排班可能只完成了一部分，下次重新完整排班
+        self.last_scheduler = None
+
+    def on_schedule_error(self, message):
+        self.finish_scheduling()
+        self.last_scheduler = None
+        QMessageBox.critical(self, "排班失败", f"排班过程中出现错误:{message}")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.first_shown:
+            self.first_shown = True
+            # 排在首次绘制事件之后执行
+            QTimer.singleShot(0, self.on_first_paint)
+
+    def on_first_paint(self):
+        self.staff_table_with_search.staff_table.load_default_roster()
+        self.first_painted.emit()
+
     def go_home(self):
         self.central_widget.setCurrentWidget(self.main_widget)
 
     def import_staff(self):
-        ExcelHandler .import_staff(self.staff_table_with_search.staff_table)
+        # Excel 读写依赖 pandas/openpyxl，首次使用时才导入
+        from utils.excel_handler import ExcelHandler
+        ExcelHandler.import_staff(self.staff_table_with_search.staff_table)
 
     def export_staff(self):
+        # Excel 读写依赖 pandas/openpyxl，首次使用时才导入
+        from utils.excel_handler import ExcelHandler
         ExcelHandler.export_staff(self.staff_table_with_search.staff_table)
     
     def export_result(self):
-        ExcelHandler.export_result(self.schedule_result_widget.result_table)
+        # Excel 读写依赖 pandas/openpyxl，首次使用时才导入
+        from utils.excel_handler import ExcelHandler
+        ExcelHandler.export_result(self.schedule_result_widget.result)
 
     def view_result(self):
         self.central_widget.setCurrentWidget(self.schedule_result_widget)
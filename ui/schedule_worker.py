@@ -0,0 +1,85 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from models.scheduler import Scheduler, SchedulingCancelled, compute_staff_delta
+from utils.profiling import profile_thread
+from utils.vaildators import validate_configuration
+
+
+class ScheduleWorkerSignals(QObject):
+    # 阶段, 已完成数, 总数
+    progress = pyqtSignal(str, int, int)
+    # 配置校验未通过的提示
+    invalid = pyqtSignal(str)
+    # 是否成功, 排班结果或错误信息, 使用的排班器
+    finished = pyqtSignal(bool, object, object)
+    cancelled = pyqtSignal()
+    error = pyqtSignal(str)
+
+
+class ScheduleWorker(QRunnable):
+    """
+    在线程池中执行校验和排班，结果通过 signals 回到界面线程。
+    staff 和 area_config 为启动前在界面线程中取得的快照，工作线程不访问任何控件。
+    给出 previous_scheduler 且使用贪心算法时，先尝试在其结果上增量排班，失败再完整排班
+    """
+
+    def __init__(self, staff, area_config, solver='greedy', repair_budget=Scheduler.DEFAULT_REPAIR_BUDGET,
+                 previous_scheduler=None, previous_staff=None):
+        super().__init__()
+        self.staff = staff
+        self.area_config = area_config
+        self.solver = solver
+        self.repair_budget = repair_budget
+        self.previous_scheduler = previous_scheduler
+        self.previous_staff = previous_staff
+        self.scheduler = None
+        self.cancelled = False
+        self.signals = ScheduleWorkerSignals()
+
+    def cancel(self):
+        # 取消标记只保存在本任务中，不设置在排班器上：上一次的排班器会被之后的增量排班复用
+        self.cancelled = True
+
+    def report_progress(self, stage, done, total):
+        # 排班器每次报告进度时检查本任务是否已取消
+        if self.cancelled:
+            raise SchedulingCancelled()
+        self.signals.progress.emit(stage, done, total)
+
+    def run(self):
+        # 开启 SCHEDULING_PROFILE 时，线程池中的排班也计入 cProfile 结果
+        with profile_thread():
+            self.run_schedule()
+
+    def run_schedule(self):
+        try:
+            self.signals.progress.emit('validate', 0, len(self.staff))
+            is_valid, validate_msg = validate_configuration(self.staff, self.area_config)
+            if self.cancelled:
+                raise SchedulingCancelled()
+            if not is_valid:
+                self.signals.invalid.emit(validate_msg)
+                return
+
+            success, result_or_message = False, None
+            # 增量排班按贪心规则调整，选择其他算法时完整排班
+            if self.previous_scheduler is not None and self.solver == 'greedy':
+                scheduler = self.previous_scheduler
+                scheduler.progress = self.report_progress
+                added, removed, modified = compute_staff_delta(self.previous_staff, self.staff)
+                success, result_or_message, _ = scheduler.reschedule(added, removed, modified, self.area_config)
+
+            if not success:
+                self.scheduler = Scheduler(self.staff, self.area_config, solver=self.solver,
+                                           repair_budget=self.repair_budget, progress=self.report_progress)
+                if self.cancelled:
+                    raise SchedulingCancelled()
+                scheduler = self.scheduler
+                success, result_or_message = scheduler.schedule()
+
+            scheduler.progress = None
+            self.signals.finished.emit(success, result_or_message, scheduler)
+        except SchedulingCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.error.emit(str(e))
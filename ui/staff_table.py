@@ -1,15 +1,42 @@
-import json 
 import os 
-import sys
-import pandas as pd
-import re
+from bisect import bisect_left
+from contextlib import contextmanager
 from PyQt6.QtWidgets import (
-QTableWidget, QTableWidgetItem,QComboBox, QHeaderView,
-QLineEdit, QWidget, QVBoxLayout, QStyledItemDelegate
+QTableView, QComboBox, QHeaderView,
+QLineEdit, QStyledItemDelegate
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-import pkgutil
-import shutil
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QThreadPool
+from models.staff_search import StaffSearchIndex
+from ui.import_worker import RosterImportWorker
+from models.staff_store import StaffStore
+from utils.config_service import get_config_copy, get_config_path
+from utils.persistence import DebouncedJsonWriter
+from utils.profiling import timed
+from utils.roster_loader import split_list_items
+
+
+def row_ranges(rows):
+    """
+    行号集合转换为按顺序排列的连续区间 [(first, last), ...]
+    """
+    ranges = []
+    for row in sorted(set(rows)):
+        if ranges and row == ranges[-1][1] + 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return [tuple(bounds) for bounds in ranges]
+
+
+def merge_ranges(ranges):
+    # 合并重叠或相邻的区间
+    merged = []
+    for first, last in sorted(ranges):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return [tuple(bounds) for bounds in merged]
 
 
 class ReadOnlyDelegate(QStyledItemDelegate):
@@ -50,48 +77,208 @@ class DoubleClickComboBoxDelegate(QStyledItemDelegate):
     def updateEditorGeometry(self, editor, option, index):
         editor.setGeometry(option.rect)
 
-class StaffTable(QTableWidget):
+class StaffTableModel(QAbstractTableModel):
+    """
+    员工表模型：数据保存在按列存储的 StaffStore 中，视图只向模型请求可见单元格。
+    下拉选项直接取自列配置，通过 UserRole 提供给 DoubleClickComboBoxDelegate
+    """
+
+    # 批量删除时超过该区间数改为压缩后重置模型
+    MAX_REMOVE_RANGES = 64
+
+    def __init__(self, columns, store, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.store = store
+        self.keys = [column_config['key'] for column_config in columns]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.store.value(index.row(), self.keys[index.column()])
+        if role == Qt.ItemDataRole.UserRole:
+            column_config = self.columns[index.column()]
+            if column_config.get('type') == 'select':
+                return column_config.get('options', [])
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        if self.store.set_value(index.row(), self.keys[index.column()], value):
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and not self.columns[index.column()].get('readonly', False):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section]['display']
+        return str(section + 1)
+
+    def reset_store(self, store):
+        self.beginResetModel()
+        self.store = store
+        self.endResetModel()
+
+    def append_records(self, records):
+        if not records:
+            return
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.store.extend(records)
+        self.endInsertRows()
+
+    def insert_records(self, row, records):
+        if not records:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(records) - 1)
+        self.store.insert_records(row, records)
+        self.endInsertRows()
+
+    def remove_range(self, first, last):
+        self.beginRemoveRows(QModelIndex(), first, last)
+        self.store.remove_range(first, last)
+        self.endRemoveRows()
+
+    def remove_rows(self, rows):
+        """
+        删除多行，返回删除的连续区间（删除前的行号）。
+        区间不多时从后往前逐段删除，视图保留选择和滚动位置；
+        区间很多时一次遍历压缩列存储并重置模型，避免逐段移动数据和逐段通知。
+        rows 可以是生成器，先取成集合，求区间和压缩存储使用同一份行号
+        """
+        rows = set(rows)
+        ranges = row_ranges(rows)
+        if len(ranges) <= self.MAX_REMOVE_RANGES:
+            for first, last in reversed(ranges):
+                self.remove_range(first, last)
+        elif ranges:
+            self.beginResetModel()
+            self.store.remove_rows(rows)
+            self.endResetModel()
+        return ranges
+
+    def update_cells(self, changes):
+        """
+        批量修改单元格，changes 为 (行, 键, 值) 序列。
+        全部写入后，每段连续的写入行（如粘贴的整块区域）只发出一次 dataChanged；返回变化的行号集合
+        """
+        written_rows = set()
+        changed_rows = set()
+        columns = set()
+        column_of = {key: column for column, key in enumerate(self.keys)}
+        for row, key, value in changes:
+            written_rows.add(row)
+            if self.store.set_value(row, key, value):
+                changed_rows.add(row)
+                columns.add(column_of[key])
+        if changed_rows:
+            roles = [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole]
+            changed = sorted(changed_rows)
+            for first, last in row_ranges(written_rows):
+                # 跳过其中没有任何单元格变化的区间
+                position = bisect_left(changed, first)
+                if position < len(changed) and changed[position] <= last:
+                    self.dataChanged.emit(self.index(first, min(columns)), self.index(last, max(columns)), roles)
+        return changed_rows
+
+
+class StaffFilterProxyModel(QSortFilterProxyModel):
+    """
+    按搜索结果过滤行：visible_rows 为可见的源模型行号集合，None 表示全部可见。
+    一次查询只调用一次 invalidateRowsFilter，不再逐行 setRowHidden
+    """
+
+    def __init__(self, source_model, parent=None):
+        super().__init__(parent)
+        self.visible_rows = None
+        self.setSourceModel(source_model)
+        source_model.rowsAboutToBeInserted.connect(self.on_rows_about_to_be_inserted)
+        source_model.rowsAboutToBeRemoved.connect(self.on_rows_about_to_be_removed)
+        source_model.modelAboutToBeReset.connect(self.on_model_about_to_be_reset)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.visible_rows is None or source_row in self.visible_rows
+
+    def set_visible_rows(self, rows):
+        self.visible_rows = rows
+        self.invalidateRowsFilter()
+
+    def on_rows_about_to_be_inserted(self, parent, first, last):
+        # 新增的行总是可见，其后的行号后移
+        if self.visible_rows is not None:
+            added = last - first + 1
+            self.visible_rows = ({row if row < first else row + added for row in self.visible_rows}
+                                 | set(range(first, last + 1)))
+
+    def on_rows_about_to_be_removed(self, parent, first, last):
+        if self.visible_rows is not None:
+            removed = last - first + 1
+            self.visible_rows = {row if row < first else row - removed
+                                 for row in self.visible_rows if not first <= row <= last}
+
+    def on_model_about_to_be_reset(self):
+        self.visible_rows = None
+
+
+class StaffTable(QTableView):
     staff_data_changed = pyqtSignal()
+    # 与 staff_data_changed 同时发出：{变化类型: [(起始行, 结束行), ...]}，
+    # 类型为 inserted、removed、updated、reset，行号为变化发生时的行号
+    rows_changed = pyqtSignal(object)
+    # 单次修改超过该行数时不逐行更新搜索索引，改为整体失效
+    MAX_INDEX_UPDATE_ROWS = 1000
+    # 后台导入：已导入行数, 估计总行数（未知为 0）
+    import_progress = pyqtSignal(int, int)
+    # 后台导入结束：导入行数, 是否被取消
+    import_finished = pyqtSignal(int, bool)
+    import_failed = pyqtSignal(str)
 
     def __init__(self):
         super().__init__()
+        self.config_writer = DebouncedJsonWriter(self.get_config_path(), indent=4)
         self.config = self.load_config()
-        self.staff_data = self.load_staff_data()
+        self.store = StaffStore(self.config['columns'])
+        self.table_model = None
+        self.filter_model = None
+        self.search_index = StaffSearchIndex(self.store, self.config['columns'])
+        self.search_query = ''
+        self.column_delegates = []
+        self.import_worker = None
+        self.import_total = 0
+        # 批量修改的嵌套层数和尚未发出的变化
+        self.bulk_depth = 0
+        self.pending_changes = {}
         self.setup_table()
         self.populate_table()
 
-    def resource_path(self,relative_path):
+    @property
+    def staff_data(self):
         """
-        在打包和开发环境中获取资源文件的正确路径
+        员工字典列表（按需从列存储生成）；赋值时整体替换列存储，需再调用 populate_table 刷新视图
         """
-        if getattr(sys, 'frozen', False):
-            return os.path.join(sys._MEIPASS, relative_path)
-        else:
-            return os.path.join(os.path.abspath("."), relative_path)
+        return self.store.to_records()
 
-    def get_config_path(self):
-        user_data_dir = os.path.join(os.path.expanduser('~'), 'SchedulingSystemConfig')
-        os.makedirs(user_data_dir, exist_ok=True)
-        config_path = os.path.join(user_data_dir, 'staff_table_config.json')
-
-        if not os.path.exists(config_path):
-            if getattr(sys, 'frozen', False):
-                # 如果是打包后的环境，从 sys._MEIPASS 目录获取资源
-                default_path = self.resource_path(os.path.join('json', 'staff_table_config.json'))
-                if os.path.exists(default_path):
-                    with open(default_path, 'rb') as src, open(config_path, 'wb') as dst:
-                        dst.write(src.read())
-                else:
-                    raise FileNotFoundError(f"无法找到打包环境下的默认配置文件: {default_path}")
-            else:
-                # 开发环境，直接从项目目录获取
-                default_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'json', 'staff_table_config.json')
-                if os.path.exists(default_path):
-                    shutil.copy(default_path, config_path)
-                else:
-                    raise FileNotFoundError(f"默认配置文件不存在: {default_path}")
+    @staff_data.setter
+    def staff_data(self, records):
+        self.store = StaffStore(self.config['columns'], records)
 
-        return config_path  # 确保在所有情况下都返回 config_path
+    def get_config_path(self):
+        return get_config_path('staff_table_config.json')
 
     def get_default_config(self):
         return {
@@ -209,9 +396,7 @@ class StaffTable(QTableWidget):
 
 
     def save_config(self, config):
-        config_path = self.get_config_path()
-        with open(config_path, 'w' ,  encoding = 'utf-8' ) as f:
-            json.dump(config, f, ensure_ascii=False, indent=4)
+        self.config_writer.schedule(config)
     
     def save_default_import(self,path):
         self.config['default_data_path'] = path
@@ -220,95 +405,239 @@ class StaffTable(QTableWidget):
     def load_config(self):
         config_path = self.get_config_path()
         if os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8')as f:
-                config = json.load(f)
+            config = get_config_copy(config_path)
         else:
             #如果配置文件不存在，使用默认配置
             config = self.get_default_config()
             self.save_config(config) 
         return config
     
-    def load_staff_data(self):
+    def default_data_full_path(self):
         excel_path = self.config.get('default_data_path','')
         if excel_path.endswith('.xlsx'):
             current_dir = os.path.dirname(os.path.abspath(__file__))
-            full_path = os.path.join(current_dir, '..', excel_path)
-            return self._load_excel(full_path)
-        return []
-    
-    def _load_excel(self, excel_path):
-        try:
-            df = pd.read_excel(excel_path)
-            display_to_key = {col['display']: col['key'] for col in self.config['columns']}
-            df.rename(columns=display_to_key, inplace=True)
-            df =df.fillna('')# 将NaN替换为空字符串
-            return df.to_dict('records')
-        except FileNotFoundError:
-            print(f"Excel文件未找到:{excel_path}")
-            return []
-        except Exception as e:
-            print(f"读取Excel文件时发生错误:{e}")
-            return []
+            return os.path.join(current_dir, '..', excel_path)
+        return None
+
+    def load_default_roster(self):
+        """
+        在后台读取默认人员表，读出的行分批出现在表格中；由主窗口在首次显示后调用，不阻塞启动。
+        没有设置默认人员表时返回 False
+        """
+        default_path = self.default_data_full_path()
+        if not default_path:
+            return False
+        self.import_excel_async(default_path)
+        return True
 
+    @timed('staff_table.setup_table')
     def setup_table(self):
-        self.setColumnCount(len(self.config['columns']))
-        self.setHorizontalHeaderLabels([col['display'] for col in self.config['columns']])
-        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.setRowCount(len(self.staff_data))
-        self.cellChanged.connect(self.on_cell_changed)
-
-        for col, column_config in enumerate(self.config['columns']):
-            if column_config.get('type')in ['text','list']:
-                self.setItemDelegateForColumn(col, EditableOnDoubleClickDelegate(self))
-            elif column_config.get('type') == 'select':
-                delegate = DoubleClickComboBoxDelegate(self)
-                self.setItemDelegateForColumn(col, delegate)
-            elif column_config.get('readonly',False):
-                self.setItemDelegateForColumn(col, ReadOnlyDelegate(self))
+        if self.table_model is None:
+            self.table_model = StaffTableModel(self.config['columns'], self.store, self)
+            self.table_model.dataChanged.connect(self.on_data_changed)
+            self.table_model.rowsInserted.connect(self.search_index.invalidate)
+            self.table_model.rowsRemoved.connect(self.search_index.invalidate)
+            self.filter_model = StaffFilterProxyModel(self.table_model, self)
+            self.setModel(self.filter_model)
+
+            # 固定行高，视图无需逐行计算高度即可定位可见行
+            self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
 
-    def populate_table(self):
-        for row, staff in enumerate(self.staff_data):
             for col, column_config in enumerate(self.config['columns']):
-                key = column_config['key']
-                default_value = column_config.get('default')
-                value = staff.get(key, default_value)
+                if column_config.get('type')in ['text','list']:
+                    delegate = EditableOnDoubleClickDelegate(self)
+                elif column_config.get('type') == 'select':
+                    delegate = DoubleClickComboBoxDelegate(self)
+                elif column_config.get('readonly',False):
+                    delegate = ReadOnlyDelegate(self)
+                else:
+                    continue
+                self.column_delegates.append(delegate)
+                self.setItemDelegateForColumn(col, delegate)
 
+    @timed('staff_table.populate_table')
+    def populate_table(self):
+        # 只重置模型，单元格在显示时才从列存储读取
+        self.table_model.reset_store(self.store)
+        self.search_index.set_store(self.store)
+        if self.search_query:
+            self.apply_search(self.search_query)
 
-                # 如果值为None且存在默认值，使用默认值
-                if value is None and default_value is not None:
-                    value = default_value
+    def rowCount(self):
+        return self.table_model.rowCount()
 
-                item = self.create_cell_item(column_config, value)
-                self.setItem(row, col, item)
+    def columnCount(self):
+        return self.table_model.columnCount()
 
-    def create_cell_item(self, column_config, value):
-        item = QTableWidgetItem(str(value))
-        if column_config.get('type') == 'select':
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
-            item.setData(Qt.ItemDataRole.UserRole, column_config.get('options', []))
-        elif column_config.get('readonly', False):
-            item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        return item
+    def cell_text(self, row, column):
+        return self.store.value(row, self.config['columns'][column]['key'])
 
     def split_list_items(self, value, column_config):
-        if isinstance(value, list):
-            return value
-        if isinstance(value, str):
-            separators = column_config.get('separators', [','])
-            pattern ='|'.join(re.escape(sep) for sep in separators)
-            return [item.strip() for item in re.split(pattern, value) if item.strip()]
-        return []
-
-    def on_cell_changed(self, row, column):
-        item = self.item(row, column)
-        if item:
-            key = self.config['columns'][column]['key']
-            self.staff_data[row][key] = item.text()
-            self.staff_data_changed.emit()
+        return split_list_items(value, column_config)
+
+    def import_excel_async(self, excel_path, use_cache=True):
+        """
+        清空表格并在后台导入人员表，返回导入任务（可连接其 signals 或调用 cancel）。
+        use_cache 为 False 时不读写人员表快照（如测量解析耗时）
+        """
+        self.cancel_import()
+        self.store = StaffStore(self.config['columns'])
+        self.populate_table()
+
+        worker = RosterImportWorker(excel_path, self.config['columns'], use_cache=use_cache)
+        worker.signals.total.connect(lambda total: self.on_import_total(worker, total))
+        worker.signals.chunk.connect(lambda chunk: self.on_import_chunk(worker, chunk))
+        worker.signals.snapshot.connect(lambda data: self.on_import_snapshot(worker, data))
+        worker.signals.finished.connect(lambda rows, cancelled: self.on_import_finished(worker, rows, cancelled))
+        worker.signals.error.connect(lambda message: self.on_import_error(worker, message))
+        self.import_worker = worker
+        self.import_total = 0
+        QThreadPool.globalInstance().start(worker)
+        return worker
+
+    def cancel_import(self):
+        """
+        取消正在进行的导入，已经追加到表格中的行保留
+        """
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+            self.import_worker = None
+            self.notify_reset()
+            self.import_finished.emit(len(self.store), True)
+
+    @property
+    def importing(self):
+        return self.import_worker is not None
+
+    # 以下回调忽略已被取消或替换的导入任务发来的信号
+    def on_import_total(self, worker, total):
+        if worker is self.import_worker:
+            self.import_total = total
+            self.import_progress.emit(len(self.store), total)
+
+    def on_import_chunk(self, worker, chunk):
+        if worker is self.import_worker:
+            self.table_model.append_records(chunk)
+            self.import_progress.emit(len(self.store), self.import_total)
+
+    def on_import_snapshot(self, worker, data):
+        if worker is self.import_worker:
+            self.store = StaffStore.from_columns(self.config['columns'], data)
+            self.populate_table()
+            self.import_progress.emit(len(self.store), self.import_total)
+
+    def on_import_finished(self, worker, rows, cancelled):
+        if worker is self.import_worker:
+            self.import_worker = None
+            self.notify_reset()
+            self.import_finished.emit(len(self.store), cancelled)
+
+    def on_import_error(self, worker, message):
+        if worker is self.import_worker:
+            self.import_worker = None
+            print(f"读取Excel文件时发生错误:{message}")
+            self.notify_reset()
+            self.import_failed.emit(message)
+
+    @timed('staff_table.apply_search')
+    def apply_search(self, query):
+        """
+        只显示命中查询的行，查询语法见 StaffSearchIndex
+        """
+        self.search_query = query
+        self.filter_model.set_visible_rows(self.search_index.search(query))
+
+    def on_data_changed(self, top_left, bottom_right, roles=None):
+        first, last = top_left.row(), bottom_right.row()
+        if last - first + 1 > self.MAX_INDEX_UPDATE_ROWS:
+            self.search_index.invalidate()
+        else:
+            key = None
+            if top_left.column() == bottom_right.column():
+                key = self.config['columns'][top_left.column()]['key']
+            for row in range(first, last + 1):
+                self.search_index.update_row(row, key)
+        self.notify_changes('updated', [(first, last)])
+
+    @contextmanager
+    def bulk_update(self):
+        """
+        批量修改：期间暂停重绘，变化通知推迟到最外层结束时合并发出一次
+        """
+        self.bulk_depth += 1
+        if self.bulk_depth == 1:
+            self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.bulk_depth -= 1
+            if self.bulk_depth == 0:
+                self.setUpdatesEnabled(True)
+                self.flush_changes()
+
+    def notify_changes(self, kind, ranges):
+        """
+        记录一次数据变化，不在批量修改中时立即发出
+        """
+        self.pending_changes.setdefault(kind, []).extend(ranges)
+        if self.bulk_depth == 0:
+            self.flush_changes()
+
+    def notify_reset(self):
+        # 整表替换（导入）后通知
+        self.notify_changes('reset', [(0, len(self.store) - 1)] if len(self.store) else [])
+
+    def flush_changes(self):
+        if not self.pending_changes:
+            return
+        changes = {kind: merge_ranges(ranges) for kind, ranges in self.pending_changes.items()}
+        self.pending_changes = {}
+        self.rows_changed.emit(changes)
+        self.staff_data_changed.emit()
+
+    def insert_rows(self, row, records):
+        """
+        在 row 之前插入多名员工，视图和搜索索引只更新一次
+        """
+        if not records:
+            return
+        with self.bulk_update():
+            self.table_model.insert_records(row, records)
+            self.notify_changes('inserted', [(row, row + len(records) - 1)])
+
+    def append_rows(self, records):
+        self.insert_rows(len(self.store), records)
+
+    def remove_rows(self, rows):
+        """
+        删除任意多行（源模型行号），返回删除的连续区间
+        """
+        with self.bulk_update():
+            ranges = self.table_model.remove_rows(rows)
+            if len(ranges) > self.table_model.MAX_REMOVE_RANGES:
+                # 模型被重置，过滤结果需要按新的行号重新计算
+                self.search_index.invalidate()
+                if self.search_query:
+                    self.apply_search(self.search_query)
+            if ranges:
+                self.notify_changes('removed', ranges)
+        return ranges
+
+    def update_cells(self, changes):
+        """
+        批量修改单元格（如粘贴），changes 为 (行, 键, 值) 序列，返回变化的行号集合
+        """
+        with self.bulk_update():
+            return self.table_model.update_cells(changes)
 
     def get_staff_data(self):
         return self.staff_data
 
+    def get_staff_store(self):
+        # 员工数据快照，可交给后台线程使用
+        return self.store.copy()
+
     def save_staff_data(self):
         excel_path = self.config.get('default_data_path','')
         if excel_path.endswith('.xlsx'):
@@ -317,7 +646,9 @@ class StaffTable(QTableWidget):
             self._save_excel(full_path)
 
     def _save_excel(self, excel_path):
-        df = pd.DataFrame(self.staff_data)
+        import pandas as pd
+
+        df = pd.DataFrame(self.store.to_columns(), columns=self.store.keys)
         key_to_display = {col['key']: col['display'] for col in self.config['columns']}
         # 将列名从键转换为显示名称
         df.rename(columns=key_to_display, inplace=True)
@@ -325,18 +656,9 @@ class StaffTable(QTableWidget):
         print(f"数据已保存到：{excel_path}")
 
     def remove_selected_rows(self):
-        selected_rows = sorted(set(index.row() for index in self.selectedIndexes()), reverse=True)
-        for row in selected_rows:
-            self.removeRow(row)
-            del self.staff_data[row]
-        self.staff_data_changed.emit()
+        self.remove_rows({self.filter_model.mapToSource(index).row()
+                          for index in self.selectionModel().selectedIndexes()})
 
     def add_empty_row(self):
         new_row = {col['key']: '' for col in self.config['columns']}
-        self.staff_data.append(new_row)
-        self.setRowCount(self.rowCount()+ 1)
-        row = self.rowCount()- 1
-        for col, column_config in enumerate(self.config['columns']):
-            item = self.create_cell_item(column_config,'')
-            self.setItem(row, col, item)
-        self.staff_data_changed.emit()
\ No newline at end of file
+        self.append_rows([new_row])
\ No newline at end of file
@@ -0,0 +1,25 @@
+from utils.config_service import get_config
+from utils.formula_engine import engine_for
+
+
+def load_area_config(config_path):
+    """
+    读取 AreaConfig.json，返回与 AreaConfig.get_config() 相同结构的配置值（不依赖 Qt）
+    """
+    return area_config_values(get_config(config_path))
+
+
+def area_config_values(config, overrides=None):
+    """
+    取各控件的默认值，overrides 中的值优先，然后重新计算合计项
+    """
+    values = {}
+    for control in config.get('uiControls', []):
+        if control['type'] in ('select', 'number'):
+            values[control['key']] = control['default']
+    if overrides:
+        values.update(overrides)
+
+    # 与 AreaConfig.update_totals 一致，按依赖顺序计算合计项
+    engine_for(config).recompute(values)
+    return values
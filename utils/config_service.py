@@ -0,0 +1,100 @@
+"""
+统一的配置文件读取：每个 JSON 文件只解析一次，按路径缓存，文件的修改时间或大小变化后自动重新读取。
+get_config 返回只读视图（字典为 MappingProxyType，列表为 tuple），可在各处共享；
+需要修改并保存配置的界面用 get_config_copy 取得可修改的副本
+"""
+import copy
+import json
+import os
+import shutil
+import sys
+import threading
+from types import MappingProxyType
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USER_CONFIG_DIR = os.path.join(os.path.expanduser('~'), 'SchedulingSystemConfig')
+
+_lock = threading.Lock()
+# 绝对路径 -> (修改时间, 文件大小, 解析结果, 只读视图)
+_cache = {}
+
+
+def resource_path(relative_path):
+    """
+    在打包和开发环境中获取资源文件的正确路径
+    """
+    if getattr(sys, 'frozen', False):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+
+def default_config_path(file_name):
+    """
+    程序自带的默认配置文件路径
+    """
+    if getattr(sys, 'frozen', False):
+        return resource_path(os.path.join('json', file_name))
+    return os.path.join(PROJECT_DIR, 'json', file_name)
+
+
+def get_config_path(file_name):
+    """
+    用户配置目录中的配置文件路径，首次运行时从默认配置复制
+    """
+    os.makedirs(USER_CONFIG_DIR, exist_ok=True)
+    config_path = os.path.join(USER_CONFIG_DIR, file_name)
+
+    if not os.path.exists(config_path):
+        default_path = default_config_path(file_name)
+        if not os.path.exists(default_path):
+            if getattr(sys, 'frozen', False):
+                raise FileNotFoundError(f"无法找到打包环境下的默认配置文件: {default_path}")
+            raise FileNotFoundError(f"默认配置文件不存在: {default_path}")
+        shutil.copy(default_path, config_path)
+
+    return config_path
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _load(path):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entry = (stat.st_mtime_ns, stat.st_size, data, freeze(data))
+    with _lock:
+        _cache[path] = entry
+    return entry
+
+
+def get_config(path):
+    """
+    返回配置文件的只读视图，文件未变化时不再读取和解析
+    """
+    return _load(path)[3]
+
+
+def get_config_copy(path):
+    """
+    返回配置文件内容的可修改副本
+    """
+    return copy.deepcopy(_load(path)[2])
+
+
+def invalidate(path=None):
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
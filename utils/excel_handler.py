@@ -1,98 +1,116 @@
-from PyQt6.QtWidgets import QFileDialog, QMessageBox, QTableWidgetItem, QComboBox, QLineEdit
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.worksheet.datavalidation import DataValidation
+import os
+from PyQt6.QtWidgets import QFileDialog, QMessageBox
+from models.staff_store import StaffStore
+from utils.profiling import count, timed
+from utils.result_writers import write_result
 
 
 class ExcelHandler:
     @staticmethod
     def import_staff(staff_table):
         file_name, _ = QFileDialog.getOpenFileName(None,"选择Excel文件","","Excel Files(*xlsx *.xls)")
-        if file_name:
-            try:
-                df = pd.read_excel(file_name)
-                staff_table.setRowCount(0)
-
-                #获取显示的列名和对应的键
-                display_to_key = {col['display']: col['key'] for col in staff_table.config['columns']}
-
-                # 确保 DataFrame 的列名与 staff_table 的显示列名一致
-                df = df.reindex(columns=list(display_to_key.keys()))
-
-                #将NaN 值替换为空字符串
-                df = df.fillna('')
-
-                staff_table.staff_data = []
-                for _, row in df.iterrows():
-                    staff = {}
-                    for display_column, key in display_to_key.items():
-                        column_config = next(col for col in staff_table.config['columns'] if col['key'] == key)
-                        if column_config.get('type') == 'list':
-                            if pd.notna(row[display_column]) and not isinstance(row[display_column], list):
-                                items = staff_table.split_list_items(str(row[display_column]), column_config)
-                                staff[key] = "、".join(items)  # 将列表重新拼接为字符串
-                            else:
-                                staff[key] = ""  # 将空值设置为空字符串
-                        else:
-                            staff[key] = str(row[display_column])
-                    # 确保空列表不会显示为 "[]"
-                    for key, value in staff.items():
-                        if isinstance(value, list) and not value:
-                            staff[key] = ""
-                    staff_table.staff_data.append(staff)
-
-                staff_table.setup_table()
-                staff_table.populate_table()
-                staff_table.staff_data_changed.emit()
-
+        if not file_name:
+            return
+
+        # 后台导入，完成或失败后提示一次
+        def on_finished(rows, cancelled):
+            disconnect()
+            if cancelled:
+                QMessageBox.information(None,"导入已取消",f"已导入 {rows} 名员工")
+            else:
                 QMessageBox.information(None,"导入成功","员工信息已成功导入")
 
-            except Exception as e:
-                QMessageBox.critical(None,"导入失败",f"导入过程中出现错误:{str(e)}")
+        def on_failed(message):
+            disconnect()
+            QMessageBox.critical(None,"导入失败",f"导入过程中出现错误:{message}")
+
+        def disconnect():
+            staff_table.import_finished.disconnect(on_finished)
+            staff_table.import_failed.disconnect(on_failed)
+
+        staff_table.import_excel_async(file_name)
+        staff_table.import_finished.connect(on_finished)
+        staff_table.import_failed.connect(on_failed)
 
     @staticmethod
     def export_staff(staff_table):
         file_name, _ = QFileDialog.getSaveFileName(None,"保存Excel文件","","Excel Files(*.xlsx)")
         if file_name:
             try:
-                wb = Workbook()
-                ws = wb.active
-
-                #写入表头
-                for col, column_config in enumerate(staff_table.config['columns'], start=1):
-                    ws.cell(row=1, column=col, value=column_config['display'])
-
-                #写入数据并设置下拉列表
-                for row in range(staff_table.rowCount()):
-                    for col, column_config in enumerate(staff_table.config['columns'], start=1):
-                        cell = ws.cell(row=row+2, column=col)
-                        widget = staff_table.cellWidget(row,col-1)
-
-                        if column_config.get('type')== 'select':
-                            if isinstance(widget, QComboBox):
-                                value = widget.currentText()
-                            else:
-                                value = staff_table.item(row, col-1).text()
-                            cell.value = value
-                            options = column_config.get('options',[])
-                            dv = DataValidation(type="list", formula1=f'"{",".join(options)}"',allow_blank=True)
-                            ws.add_data_validation(dv)
-                            dv.add(cell)
-                        elif column_config.get('type')== 'list':
-                            value = widget.text() if isinstance(widget, QLineEdit) else staff_table.item(row, col-1).text()
-                            cell.value = "" if value == "[]" else value
-                        else:
-                            value = widget.text() if isinstance(widget, QLineEdit) else staff_table.item(row, col-1).text()
-                            cell.value = value
-
-                wb.save(file_name)
+                ExcelHandler.export_staff_file(staff_table.store, staff_table.config['columns'], file_name)
                 QMessageBox.information(None,"导出成功",f"员工信息已成功导出到 {file_name}")
 
             except PermissionError:
                 QMessageBox.critical(None,"导出失败","无法写入文件。请确保文件没有被其他程序打开，并且您有写入权限。")
             except Exception as e:
-                QMessageBox.critical(None,"导入失败",f"导入过程中出现错误:{str(e)}")
+                QMessageBox.critical(None,"导出失败",f"导出过程中出现错误:{str(e)}")
+
+    @staticmethod
+    @timed('excel.export_staff')
+    def export_staff_file(staff_data, columns, file_name):
+        """
+        直接从 staff_data（StaffStore 或员工字典列表）写出员工表（只写模式工作簿，逐行写入磁盘）。
+        下拉列表按列添加一个数据验证，覆盖整列数据区域
+        """
+        # openpyxl 只在导出时导入，不拖慢启动
+        from openpyxl import Workbook
+        from openpyxl.utils import get_column_letter
+        from openpyxl.worksheet.datavalidation import DataValidation
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+
+        #写入表头
+        ws.append([column_config['display'] for column_config in columns])
+
+        #写入数据
+        keys = [(column_config['key'], column_config.get('default', '')) for column_config in columns]
+        if isinstance(staff_data, StaffStore):
+            # 直接按列取值，不生成逐行字典
+            rows = zip(*(staff_data.column(key) for key, _ in keys))
+        else:
+            rows = ([staff.get(key, default) for key, default in keys] for staff in staff_data)
+        for values in rows:
+            ws.append(["" if value is None or value == "[]" else str(value) for value in values])
+        count('excel.exported_rows', len(staff_data))
+
+        #每个下拉列只设置一个数据验证
+        last_row = len(staff_data) + 1
+        if last_row > 1:
+            for col, column_config in enumerate(columns, start=1):
+                if column_config.get('type') == 'select':
+                    options = column_config.get('options', [])
+                    dv = DataValidation(type="list", formula1=f'"{",".join(options)}"', allow_blank=True)
+                    letter = get_column_letter(col)
+                    dv.add(f"{letter}2:{letter}{last_row}")
+                    ws.data_validations.append(dv)
+
+        wb.save(file_name)
+
+    @staticmethod
+    def export_result(result):
+        if not result:
+            QMessageBox.warning(None,"导出失败","还没有排班结果，请先排班")
+            return
+
+        file_name, _ = QFileDialog.getSaveFileName(
+            None,"保存排班结果","",
+            "Excel 文件(*.xlsx);;CSV 文件(*.csv);;JSON Lines 文件(*.jsonl)"
+        )
+        if file_name:
+            try:
+                ExcelHandler.export_result_file(result, file_name)
+                QMessageBox.information(None,"导出成功",f"排班结果已成功导出到 {file_name}")
+
+            except PermissionError:
+                QMessageBox.critical(None,"导出失败","无法写入文件。请确保文件没有被其他程序打开，并且您有写入权限。")
+            except Exception as e:
+                QMessageBox.critical(None,"导出失败",f"导出过程中出现错误:{str(e)}")
 
     @staticmethod
-    def export_result(staff_table):
-        pass
\ No newline at end of file
+    @timed('excel.export_result')
+    def export_result_file(result, file_name):
+        # 未填写扩展名时按 xlsx 导出
+        if not os.path.splitext(file_name)[1]:
+            file_name += '.xlsx'
+        return write_result(result, file_name)
\ No newline at end of file
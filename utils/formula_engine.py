@@ -0,0 +1,172 @@
+"""
+AreaConfig.json 中 calculations 合计公式的求值：
+公式只解析一次，编译为只支持四则运算、数字、变量和 min/max/abs 的表达式树（不使用 eval），
+再按目标之间的依赖关系建图，某个值变化时只按拓扑顺序重算受影响的目标
+"""
+import ast
+import operator
+from functools import lru_cache
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+FUNCTIONS = {
+    'min': min,
+    'max': max,
+    'abs': abs,
+}
+
+
+class FormulaError(ValueError):
+    pass
+
+
+def _compile_node(node, names):
+    """
+    把语法树节点编译为 values -> 数值 的函数，并把用到的变量加入 names
+    """
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return lambda values: value
+    if isinstance(node, ast.Name):
+        name = node.id
+        names.add(name)
+
+        def lookup(values):
+            try:
+                return values[name]
+            except KeyError:
+                raise FormulaError(f"未定义的变量：{name}") from None
+        return lookup
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        op = BINARY_OPERATORS[type(node.op)]
+        left = _compile_node(node.left, names)
+        right = _compile_node(node.right, names)
+        return lambda values: op(left(values), right(values))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        op = UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, names)
+        return lambda values: op(operand(values))
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS
+            and not node.keywords and node.args):
+        func = FUNCTIONS[node.func.id]
+        args = [_compile_node(arg, names) for arg in node.args]
+        return lambda values: func(*(arg(values) for arg in args))
+    raise FormulaError(f"公式中不支持的写法：{ast.dump(node)}")
+
+
+def compile_formula(formula):
+    """
+    返回 (求值函数, 依赖的变量集合)
+    """
+    try:
+        tree = ast.parse(formula, mode='eval')
+    except SyntaxError as e:
+        raise FormulaError(f"公式语法错误：{formula}") from e
+    names = set()
+    return _compile_node(tree.body, names), frozenset(names)
+
+
+class FormulaEngine:
+    """
+    calculations 为 [{"target": 键, "formula": 公式}, ...]。
+    构造时编译全部公式并做拓扑排序，目标重复或存在循环依赖时抛出 FormulaError
+    """
+
+    def __init__(self, calculations):
+        self.formulas = {}
+        self.dependencies = {}
+        for calc in calculations:
+            target = calc['target']
+            if target in self.formulas:
+                raise FormulaError(f"合计项重复定义：{target}")
+            self.formulas[target], self.dependencies[target] = compile_formula(calc['formula'])
+
+        # 变量 -> 直接依赖它的目标
+        self.dependents = {}
+        for target, names in self.dependencies.items():
+            for name in names:
+                self.dependents.setdefault(name, []).append(target)
+
+        self.order = self._topological_order()
+        self.position = {target: i for i, target in enumerate(self.order)}
+        self._affected_cache = {}
+
+    def _topological_order(self):
+        pending = {target: sum(1 for name in names if name in self.formulas)
+                   for target, names in self.dependencies.items()}
+        ready = [target for target in self.formulas if pending[target] == 0]
+        order = []
+        while ready:
+            target = ready.pop()
+            order.append(target)
+            for dependent in self.dependents.get(target, ()):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.formulas):
+            cycle = sorted(target for target, count in pending.items() if count > 0)
+            raise FormulaError(f"合计项存在循环依赖：{'、'.join(cycle)}")
+        return order
+
+    @property
+    def targets(self):
+        return self.order
+
+    def affected(self, changed):
+        """
+        changed 中任一键变化后需要重算的目标，按拓扑顺序排列
+        """
+        changed = frozenset(changed)
+        result = self._affected_cache.get(changed)
+        if result is None:
+            found = set()
+            stack = list(changed)
+            while stack:
+                for dependent in self.dependents.get(stack.pop(), ()):
+                    if dependent not in found:
+                        found.add(dependent)
+                        stack.append(dependent)
+            result = sorted(found, key=self.position.__getitem__)
+            self._affected_cache[changed] = result
+        return result
+
+    def recompute(self, values, changed=None, adjust=None):
+        """
+        在 values 上重算目标（结果取整，与界面显示的整数一致）并写回 values，
+        返回 {目标: 新值}。changed 为 None 时重算全部目标。
+        adjust(目标, 值) 可返回实际采用的值（如被控件范围截断后的值），后续目标使用该值
+        """
+        targets = self.order if changed is None else self.affected(changed)
+        updated = {}
+        for target in targets:
+            value = int(self.formulas[target](values))
+            if adjust is not None:
+                value = adjust(target, value)
+            values[target] = value
+            updated[target] = value
+        return updated
+
+
+@lru_cache(maxsize=32)
+def _cached_engine(calculations):
+    return FormulaEngine([{'target': target, 'formula': formula} for target, formula in calculations])
+
+
+def engine_for(config):
+    """
+    返回 AreaConfig 内容对应的公式引擎，相同的公式只编译一次
+    """
+    calculations = tuple((calc['target'], calc['formula']) for calc in config.get('calculations', []))
+    return _cached_engine(calculations)
@@ -0,0 +1,93 @@
+"""
+配置文件持久化：原子写入（先写同目录临时文件再替换），以及合并短时间内多次保存的延迟写入
+"""
+import json
+import os
+import stat
+import tempfile
+import weakref
+
+from utils import config_service
+
+# 所有延迟写入器，退出时统一写出
+_writers = weakref.WeakSet()
+
+# 进程的 umask 只能通过设置来读取，导入时读取一次，避免写入时（可能在后台线程中）临时修改
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def replace_file(temp_path, path):
+    """
+    用 os.replace 把临时文件替换为 path。mkstemp 创建的文件权限为 0600，
+    替换前改为原文件的权限；原文件不存在时使用按 umask 新建文件的默认权限
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(temp_path, mode)
+    os.replace(temp_path, path)
+
+
+def atomic_write_json(path, data, indent=2):
+    """
+    写入 JSON 文件：内容先写入同目录的临时文件并落盘，再用 os.replace 替换，
+    写入中途崩溃也不会留下截断的文件
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        replace_file(temp_path, path)
+        config_service.invalidate(path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class DebouncedJsonWriter:
+    """
+    延迟写入：schedule() 只记录待保存的数据并重新计时，停止修改 delay_ms 毫秒后写入一次。
+    写入时序列化的是最新数据；程序退出前调用 flush_all() 写出尚未保存的修改
+    """
+
+    def __init__(self, path, delay_ms=500, indent=2):
+        from PyQt6.QtCore import QTimer
+
+        self.path = path
+        self.indent = indent
+        self.pending = None
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+        _writers.add(self)
+
+    def schedule(self, data):
+        self.pending = data
+        self.timer.start()
+
+    def flush(self):
+        self.timer.stop()
+        if self.pending is None:
+            return
+        data, self.pending = self.pending, None
+        try:
+            atomic_write_json(self.path, data, self.indent)
+        except OSError as e:
+            print(f"保存配置文件 {self.path} 时出错：{e}")
+
+    @property
+    def has_pending(self):
+        return self.pending is not None
+
+
+def flush_all():
+    for writer in list(_writers):
+        writer.flush()
@@ -0,0 +1,146 @@
+"""
+全流程计时和计数：导入 -> 校验 -> 排班 -> 显示 各环节用 span/timed 记录耗时，
+通过 get_report() 读取汇总，另可开启 cProfile 采集完整调用栈
+"""
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+# 名称 -> [次数, 总耗时, 最长耗时, 最近一次耗时]
+_spans = {}
+_counters = {}
+_profiler = None
+# 工作线程中采集的 cProfile 数据，停止采集时合并
+_thread_profilers = []
+
+
+def _record_span(name, elapsed):
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            _spans[name] = [1, elapsed, elapsed, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+            stats[3] = elapsed
+
+
+@contextmanager
+def span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_span(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """
+    装饰器：记录函数每次调用的耗时
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record_span(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def get_report():
+    with _lock:
+        spans = {
+            name: {
+                'count': calls,
+                'total_seconds': total,
+                'mean_seconds': total / calls,
+                'max_seconds': longest,
+                'last_seconds': last,
+            }
+            for name, (calls, total, longest, last) in _spans.items()
+        }
+        return {'spans': spans, 'counters': dict(_counters)}
+
+
+def report_json(indent=2):
+    return json.dumps(get_report(), ensure_ascii=False, indent=indent)
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def start_cprofile():
+    """
+    开启 cProfile 采集（只采集调用本函数的线程，工作线程用 profile_thread 采集）
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+@contextmanager
+def profile_thread():
+    """
+    在工作线程（如 QThreadPool 中的任务）里使用：已开启 cProfile 时为当前线程单独采集，
+    结束后并入 stop_cprofile 保存的结果；未开启时不做任何事
+    """
+    if _profiler is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12 起 cProfile 基于 sys.monitoring，同时只能开启一个采集器，且它已覆盖所有线程
+        profiler = None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            with _lock:
+                _thread_profilers.append(profiler)
+
+
+def stop_cprofile(path=None, sort='cumulative', limit=40):
+    """
+    停止 cProfile 采集，合并工作线程的采集结果；给出 path 时保存原始数据（可用 snakeviz 等工具查看），返回文本摘要
+    """
+    global _profiler
+    if _profiler is None:
+        return ''
+    _profiler.disable()
+    output = io.StringIO()
+    stats = pstats.Stats(_profiler, stream=output)
+    with _lock:
+        for profiler in _thread_profilers:
+            stats.add(profiler)
+        _thread_profilers.clear()
+    if path:
+        stats.dump_stats(path)
+    stats.sort_stats(sort).print_stats(limit)
+    _profiler = None
+    return output.getvalue()
+
+
+def cprofile_enabled():
+    return _profiler is not None
@@ -0,0 +1,106 @@
+"""
+排班结果导出：把 Scheduler.generate_result_dict() 的结构展开为逐人一行，
+支持 xlsx（只写模式）、CSV 和 JSON Lines，均为边生成边写入。
+
+results 为 [(来源, 排班结果字典), ...] 的可迭代对象，来源为 None 时不输出来源列；
+可以传入生成器，在一次遍历中写出多份排班结果
+"""
+import csv
+import json
+import os
+
+RESULT_HEADERS = ["区域", "环节", "序号", "姓名"]
+SOURCE_HEADER = "来源"
+
+# 扩展名 -> 格式
+FORMATS = {
+    '.xlsx': 'xlsx',
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+}
+
+
+def iter_result_rows(result):
+    """
+    逐人展开排班结果：(区域, 环节, 序号, 姓名)，序号从 1 开始
+    """
+    for area, sections in result.items():
+        for section, names in sections.items():
+            for index, name in enumerate(names, start=1):
+                yield area, section, index, name
+
+
+def _iter_rows(results):
+    for source, result in results:
+        for row in iter_result_rows(result):
+            yield source, row
+
+
+def _headers(with_source):
+    return ([SOURCE_HEADER] if with_source else []) + RESULT_HEADERS
+
+
+def write_results_xlsx(results, path, with_source=False):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("排班结果")
+    ws.append(_headers(with_source))
+    count = 0
+    for source, row in _iter_rows(results):
+        ws.append(([source] if with_source else []) + list(row))
+        count += 1
+    wb.save(path)
+    return count
+
+
+def write_results_csv(results, path, with_source=False):
+    # utf-8-sig 便于 Excel 直接打开中文
+    count = 0
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(_headers(with_source))
+        for source, row in _iter_rows(results):
+            writer.writerow(([source] if with_source else []) + list(row))
+            count += 1
+    return count
+
+
+def write_results_jsonl(results, path, with_source=False):
+    keys = (['source'] if with_source else []) + ['area', 'section', 'index', 'name']
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for source, row in _iter_rows(results):
+            values = ([source] if with_source else []) + list(row)
+            f.write(json.dumps(dict(zip(keys, values)), ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+
+WRITERS = {
+    'xlsx': write_results_xlsx,
+    'csv': write_results_csv,
+    'jsonl': write_results_jsonl,
+}
+
+
+def format_for_path(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"不支持的导出格式：{extension or path}")
+    return FORMATS[extension]
+
+
+def write_results(results, path, fmt=None, with_source=True):
+    """
+    批量写出多份排班结果，返回写出的行数。fmt 为 None 时按扩展名判断格式
+    """
+    return WRITERS[fmt or format_for_path(path)](results, path, with_source)
+
+
+def write_result(result, path, fmt=None):
+    """
+    写出单份排班结果，返回写出的行数
+    """
+    return WRITERS[fmt or format_for_path(path)]([(None, result)], path, False)
@@ -0,0 +1,81 @@
+"""
+人员表快照缓存：把解析后的员工数据按列（{key: [值, ...]}）用 marshal 保存到用户配置目录，
+以人员表的绝对路径、文件大小、修改时间、列配置和 Python 版本为键。
+人员表未变化时直接读取快照，文件或列配置一变，键不匹配，快照自动失效
+"""
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+
+from utils.config_service import USER_CONFIG_DIR
+from utils.persistence import replace_file
+
+CACHE_DIR = os.path.join(USER_CONFIG_DIR, 'roster_cache')
+# 快照格式或解析规则变化时递增
+CACHE_VERSION = 2
+
+
+def cache_path_for(excel_path):
+    digest = hashlib.sha1(os.path.abspath(excel_path).encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.snapshot")
+
+
+def columns_signature(columns):
+    # 影响解析结果的列配置
+    return tuple(
+        (col['key'], col['display'], col.get('type', ''), tuple(col.get('separators', ())))
+        for col in columns
+    )
+
+
+def snapshot_key(excel_path, columns):
+    stat = os.stat(excel_path)
+    return (
+        CACHE_VERSION,
+        tuple(sys.version_info[:2]),
+        os.path.abspath(excel_path),
+        stat.st_size,
+        stat.st_mtime_ns,
+        columns_signature(columns),
+    )
+
+
+def load_snapshot(excel_path, columns):
+    """
+    返回快照中的列数据 {key: [值, ...]}；没有快照或快照已失效时返回 None
+    """
+    try:
+        key = snapshot_key(excel_path, columns)
+        # 一次读入再解析，比 marshal.load 逐段读取文件快得多
+        with open(cache_path_for(excel_path), 'rb') as f:
+            cached_key, data = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if cached_key != key:
+        return None
+    return data
+
+
+def save_snapshot(excel_path, columns, data, key=None):
+    """
+    保存列数据快照（先写临时文件再替换）；写入失败只放弃缓存，不影响导入。
+    key 应在开始解析前用 snapshot_key 取得，避免解析期间文件被修改时缓存到旧数据
+    """
+    try:
+        if key is None:
+            key = snapshot_key(excel_path, columns)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=CACHE_DIR)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump((key, data), f)
+            replace_file(temp_path, cache_path_for(excel_path))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    except (OSError, ValueError):
+        return False
+    return True
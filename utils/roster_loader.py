@@ -0,0 +1,174 @@
+import re
+
+# 列表列统一使用的连接符
+LIST_JOINER = "、"
+
+# 流式读取时每批返回的行数
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def split_list_items(value, column_config):
+    """
+    按列配置中的分隔符拆分列表列的值
+    """
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        separators = column_config.get('separators', [','])
+        pattern ='|'.join(re.escape(sep) for sep in separators)
+        return [item.strip() for item in re.split(pattern, value) if item.strip()]
+    return []
+
+
+def separator_pattern(column_config):
+    separators = column_config.get('separators', [','])
+    return '|'.join(re.escape(sep) for sep in separators)
+
+
+def cell_text(value):
+    """
+    单元格取值统一转换为文本，pandas 和 openpyxl 两条读取路径共用：
+    空值（None、NaN、空字符串）为 ''，整数值的浮点数去掉小数部分（1001.0 -> '1001'）
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        if value != value:
+            return ''
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+class _RowConverter:
+    """
+    逐行转换器：列位置、类型和分隔符正则在表头解析时确定一次，供 openpyxl 流式读取使用。
+    单元格文本（cell_text）和空行规则与按列转换的 records_from_frame 相同，同一人员表得到相同的员工记录
+    """
+
+    def __init__(self, header, columns):
+        positions = {}
+        for i, name in enumerate(header):
+            if name is not None:
+                positions.setdefault(str(name), i)
+        self.fields = []
+        for column_config in columns:
+            position = positions.get(column_config['display'])
+            splitter = None
+            if column_config.get('type') == 'list':
+                splitter = re.compile(separator_pattern(column_config))
+            self.fields.append((column_config['key'], position, splitter))
+
+    def __call__(self, row):
+        staff = {}
+        for key, position, splitter in self.fields:
+            text = cell_text(row[position]) if position is not None and position < len(row) else ''
+            if splitter is not None and text:
+                text = LIST_JOINER.join(item.strip() for item in splitter.split(text) if item.strip())
+            staff[key] = text
+        return staff
+
+    def records(self, rows):
+        # 配置的各列全部为空的行是空行，两条读取路径都跳过
+        for row in rows:
+            staff = self(row)
+            if any(staff.values()):
+                yield staff
+
+
+def _list_patterns(column_config):
+    """
+    列表列整列拆分用的两个正则：去掉开头、结尾的分隔符和空白；中间连续的分隔符和空白换成 LIST_JOINER。
+    结果与逐项 split、strip、去空后再连接相同
+    """
+    separator = f'(?:\\s*(?:{separator_pattern(column_config)}))'
+    return f'^{separator}*\\s*|{separator}*\\s*\\Z', f'{separator}+\\s*'
+
+
+def _column_texts(values):
+    # 整列转换为文本，多数单元格已是字符串，不再逐个调用 cell_text
+    return [value if value.__class__ is str else cell_text(value) for value in values]
+
+
+def _join_list_column(texts, column_config):
+    """
+    用 pandas 字符串方法整列拆分、连接列表列，只处理非空单元格
+    """
+    import pandas as pd
+
+    series = pd.Series(texts, dtype=object)
+    filled = series != ''
+    if not filled.any():
+        return texts
+    edges, inner = _list_patterns(column_config)
+    series[filled] = series[filled].str.replace(edges, '', regex=True).str.replace(inner, LIST_JOINER, regex=True)
+    return series.tolist()
+
+
+def records_from_frame(df, columns):
+    """
+    将 DataFrame 按列转换为以 key 为键的员工字典列表，单元格文本和空行规则与流式读取相同：
+    每列整列转换为文本，列表列整列拆分、连接，最后按行组装并跳过配置的各列全部为空的行。
+    DataFrame 应以 dtype=object、keep_default_na=False 读取（见 load_roster），保留单元格原值
+    """
+    positions = {}
+    for i, name in enumerate(df.columns):
+        if name is not None:
+            positions.setdefault(str(name), i)
+
+    keys = []
+    data = []
+    for column_config in columns:
+        position = positions.get(column_config['display'])
+        if position is None:
+            texts = [''] * len(df)
+        else:
+            texts = _column_texts(df.iloc[:, position].tolist())
+            if column_config.get('type') == 'list':
+                texts = _join_list_column(texts, column_config)
+        keys.append(column_config['key'])
+        data.append(texts)
+
+    return [dict(zip(keys, values)) for values in zip(*data) if any(values)]
+
+
+def load_roster(excel_path, columns):
+    """
+    读取 Excel 人员表（.xlsx 和 .xls），将显示列名转换为键，返回员工字典列表（不依赖 Qt）
+    """
+    # pandas 导入较慢，首次读取人员表时才导入
+    import pandas as pd
+
+    # 不做类型推断和缺失值识别：数字列中有空格时不会变成浮点数，"NA" 等文字也按原样保留
+    df = pd.read_excel(excel_path, dtype=object, keep_default_na=False, na_values=[])
+    return records_from_frame(df, columns)
+
+
+def iter_roster_chunks(excel_path, columns, chunk_size=DEFAULT_CHUNK_SIZE, size_hint=None):
+    """
+    以只读模式流式读取 .xlsx 人员表，每次返回最多 chunk_size 名员工，不构建完整的 DataFrame。
+    空行按与 load_roster 相同的规则跳过。给出 size_hint 时，打开文件后用工作表记录的数据行数（可能为 None）调用一次
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        if size_hint is not None:
+            size_hint(max(ws.max_row - 1, 0) if ws.max_row else None)
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        convert = _RowConverter(header, columns)
+
+        chunk = []
+        for staff in convert.records(rows):
+            chunk.append(staff)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        wb.close()
@@ -0,0 +1,118 @@
+"""
+启动耗时测量：在导入其他模块之前调用 install()，之后每个模块的导入（执行模块代码）都会被计时，
+再用 mark() 记录启动各阶段（创建 QApplication、创建主窗口、首次绘制、默认人员表读取完成等）相对安装时刻的耗时。
+打包后的程序同样适用（PyInstaller 的导入器也在 sys.meta_path 中）
+"""
+import json
+import sys
+import time
+
+
+class _TimedLoader:
+    """
+    包装原加载器，记录 create_module（扩展模块在此加载）和 exec_module 的耗时，其余属性转发给原加载器
+    """
+
+    def __init__(self, loader, name, profile):
+        self._loader = loader
+        self._name = name
+        self._profile = profile
+
+    def create_module(self, spec):
+        create = getattr(self._loader, 'create_module', None)
+        if create is None:
+            return None
+        self._profile.begin(self._name)
+        try:
+            return create(spec)
+        finally:
+            self._profile.end(self._name)
+
+    def exec_module(self, module):
+        self._profile.begin(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile.end(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class StartupProfile:
+    def __init__(self):
+        self.start = time.perf_counter()
+        # 模块名 -> [含子模块的耗时, 自身耗时]
+        self.imports = {}
+        self.stack = []
+        self.marks = []
+        self.installed = False
+
+    def install(self):
+        if not self.installed:
+            sys.meta_path.insert(0, self)
+            self.installed = True
+
+    def uninstall(self):
+        if self.installed:
+            sys.meta_path.remove(self)
+            self.installed = False
+
+    def find_spec(self, fullname, path, target=None):
+        # 交给其余的查找器，只替换找到的加载器
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, fullname, self)
+                return spec
+        return None
+
+    def begin(self, name):
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def end(self, name):
+        _, started, children = self.stack.pop()
+        elapsed = time.perf_counter() - started
+        if self.stack:
+            self.stack[-1][2] += elapsed
+        stats = self.imports.setdefault(name, [0.0, 0.0])
+        stats[0] += elapsed
+        stats[1] += elapsed - children
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.start))
+
+    def report(self, limit=30):
+        top_level = {name: stats for name, stats in self.imports.items() if '.' not in name}
+        by_package = sorted(top_level.items(), key=lambda item: -item[1][0])
+        by_self = sorted(self.imports.items(), key=lambda item: -item[1][1])
+        return {
+            'marks_seconds': dict(self.marks),
+            'imported_modules': len(self.imports),
+            'import_seconds': sum(stats[1] for stats in self.imports.values()),
+            'top_level_imports': [
+                {'module': name, 'cumulative_seconds': total, 'self_seconds': own}
+                for name, (total, own) in by_package[:limit]
+            ],
+            'slowest_modules': [
+                {'module': name, 'cumulative_seconds': total, 'self_seconds': own}
+                for name, (total, own) in by_self[:limit]
+            ],
+        }
+
+    def write(self, path=None):
+        """
+        path 为空或 '1' 时输出到标准错误，否则写入 JSON 文件
+        """
+        output = json.dumps(self.report(), ensure_ascii=False, indent=2)
+        if not path or path == '1':
+            print(output, file=sys.stderr)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(output)
@@ -1,16 +1,209 @@
+from collections import Counter
+
+from models.assignment_state import allowed_areas
+from models.scheduler import load_scheduler_text
+from models.staff_store import StaffStore
+from utils.profiling import timed
+
+# 报告中列出员工姓名的最大数量
+MAX_LISTED_NAMES = 10
+
+
+class FeasibilityReport:
+    """
+    排班前的可行性分析结果：
+    counts 为各团队、各固定区域的出勤人数和各区域的可用容量，
+    violations 为违反的约束，每项包含 constraint、message、required、available
+    """
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.violations = []
+
+    @property
+    def feasible(self):
+        return not self.violations
+
+    def add_violation(self, constraint, message, required=None, available=None, **details):
+        violation = {
+            'constraint': constraint,
+            'message': message,
+            'required': required,
+            'available': available,
+        }
+        violation.update(details)
+        self.violations.append(violation)
+
+    def message(self):
+        if self.feasible:
+            return "配置有效"
+        return "\n".join(violation['message'] for violation in self.violations)
+
+
+def _category_decoder(store, key):
+    if key in store.categories:
+        return store.categories[key].__getitem__
+    return str
+
+
+def attending_groups(staff_list):
+    """
+    统计出勤员工 {(队名, 固定区域): 人数}。
+    staff_list 为 StaffStore 时直接比较和计数整数编码，最后才换回取值
+    """
+    if isinstance(staff_list, StaffStore):
+        present = staff_list.code_of('Attendance', "Y")
+        if present is None:
+            return {}
+        counts = Counter(
+            (team_code, fixed_code)
+            for attendance, team_code, fixed_code in zip(staff_list.codes('Attendance'),
+                                                        staff_list.codes('team_name'),
+                                                        staff_list.codes('fixed_area'))
+            if attendance == present
+        )
+        team_of = _category_decoder(staff_list, 'team_name')
+        fixed_of = _category_decoder(staff_list, 'fixed_area')
+        return {(team_of(team_code), fixed_of(fixed_code)): members
+                for (team_code, fixed_code), members in counts.items()}
+
+    return Counter((staff.get('team_name', ''), staff.get('fixed_area', ''))
+                   for staff in staff_list if staff.get('Attendance') == "Y")
+
+
+def attending_names(staff_list, groups):
+    """
+    属于 groups 中（队名, 固定区域）组合的出勤员工姓名
+    """
+    if isinstance(staff_list, StaffStore):
+        rows = staff_list.rows_where('Attendance', "Y")
+        return [staff_list.value(row, 'name') for row in rows
+                if (staff_list.value(row, 'team_name'), staff_list.value(row, 'fixed_area')) in groups]
+    return [staff.get('name', '') for staff in staff_list
+            if staff.get('Attendance') == "Y"
+            and (staff.get('team_name', ''), staff.get('fixed_area', '')) in groups]
+
+
+def duplicate_attending_names(staff_list):
+    """
+    重复的出勤员工姓名（按首次出现的顺序）。排班按姓名记录岗位，同名员工无法分别分配
+    """
+    if isinstance(staff_list, StaffStore):
+        names = (staff_list.value(row, 'name') for row in staff_list.rows_where('Attendance', "Y"))
+    else:
+        names = (staff.get('name', '') for staff in staff_list if staff.get('Attendance') == "Y")
+    counts = Counter(names)
+    return [name for name, members in counts.items() if members > 1]
+
+
+def check_feasibility(staff_list, area_config, text=None):
+    """
+    O(n) 统计出勤员工（员工字典列表或 StaffStore），检查姓名是否重复、人数是否超出各区域容量。
+    只依赖团队规则和容量，不受贪心分配顺序影响：满足这些约束时一定存在完整的分配方案（组约束除外）
+    """
+    if text is None:
+        text = load_scheduler_text()
+
+    inbound_capacity = min(area_config['Inbound_total'], area_config['Inbound_Front'] + area_config['Inbound_back'])
+    outbound_capacity = min(area_config['Outbound_total'], area_config['Outbound_Front'] + area_config['Outbound_back'])
+
+    # 按（队名, 固定区域）分组计数，可分配区域和违规情况每组只判断一次
+    groups = attending_groups(staff_list)
+    team_counts = {}
+    fixed_counts = {'inbound': 0, 'outbound': 0}
+    area_only = {'inbound': 0, 'outbound': 0}
+    attending = 0
+    unknown_groups = set()
+    invalid_fixed_groups = set()
+    valid_fixed_areas = ('', text['inbound'], text['outbound'])
+
+    for (team_name, fixed_area), members in groups.items():
+        attending += members
+        team_counts[team_name] = team_counts.get(team_name, 0) + members
+
+        if fixed_area not in valid_fixed_areas:
+            invalid_fixed_groups.add((team_name, fixed_area))
+        elif fixed_area == text['inbound']:
+            fixed_counts['inbound'] += members
+        elif fixed_area == text['outbound']:
+            fixed_counts['outbound'] += members
+
+        areas = allowed_areas({'team_name': team_name, 'fixed_area': fixed_area}, area_config, text)
+        if not areas:
+            unknown_groups.add((team_name, fixed_area))
+        elif len(areas) == 1:
+            area_only[areas[0]] += members
+
+    # 只有存在违规时才再遍历一次取出员工姓名
+    unknown_team = attending_names(staff_list, unknown_groups) if unknown_groups else []
+    invalid_fixed_area = attending_names(staff_list, invalid_fixed_groups) if invalid_fixed_groups else []
+
+    report = FeasibilityReport({
+        'attending': attending,
+        'teams': team_counts,
+        'fixed_area': fixed_counts,
+        'inbound_only': area_only['inbound'],
+        'outbound_only': area_only['outbound'],
+        'inbound_capacity': inbound_capacity,
+        'outbound_capacity': outbound_capacity,
+    })
+
+    if unknown_team:
+        report.add_violation(
+            'unknown_team',
+            f"{len(unknown_team)} 名出勤员工的队名不属于入境队、出境队或机动队：{'、'.join(unknown_team[:MAX_LISTED_NAMES])}",
+            staff=unknown_team,
+        )
+    duplicate_names = duplicate_attending_names(staff_list)
+    if duplicate_names:
+        report.add_violation(
+            'duplicate_name',
+            f"{len(duplicate_names)} 个姓名在出勤员工中重复，同名员工无法分别排班：{'、'.join(duplicate_names[:MAX_LISTED_NAMES])}",
+            staff=duplicate_names,
+        )
+    if invalid_fixed_area:
+        report.add_violation(
+            'invalid_fixed_area',
+            f"{len(invalid_fixed_area)} 名出勤员工的固定区域无效：{'、'.join(invalid_fixed_area[:MAX_LISTED_NAMES])}",
+            staff=invalid_fixed_area,
+        )
+
+    for area, capacity in (('inbound', inbound_capacity), ('outbound', outbound_capacity)):
+        label = text[area]
+        if fixed_counts[area] > capacity:
+            report.add_violation(
+                f'fixed_{area}_capacity',
+                f"固定{label}区域员工 {fixed_counts[area]} 人，超过{label}可用人数 {capacity}",
+                required=fixed_counts[area], available=capacity,
+            )
+        elif area_only[area] > capacity:
+            report.add_violation(
+                f'{area}_capacity',
+                f"只能分配到{label}的员工（{label}队及固定{label}）共 {area_only[area]} 人，超过{label}可用人数 {capacity}",
+                required=area_only[area], available=capacity,
+            )
+
+    if attending > inbound_capacity + outbound_capacity:
+        report.add_violation(
+            'total_capacity',
+            f"出勤员工 {attending} 人，超过入境和出境可用人数之和 {inbound_capacity + outbound_capacity}",
+            required=attending, available=inbound_capacity + outbound_capacity,
+        )
+    return report
+
+
+@timed('validate_configuration')
 def validate_configuration(staff_list, area_config):
+    report = check_feasibility(staff_list, area_config)
 
-    # 统计出勤的员工数量（假设出勤标识为 "Y" 存储在键 "Attendance" 中）
-    attending_count = sum(1 for staff in staff_list if staff.get("Attendance") == "Y")
-    
     # 这里假设配置中总出勤人数存储在 "total_attendance" 键中
     total_required = area_config.get("total_attendance")
-    
-    if total_required is None:
-        # 如果配置中没有要求就认为校验通过
-        return True, "配置中不存在总出勤人数要求"
-    
-    if attending_count != total_required:
-        return False, f"出勤人数不匹配：当前出勤人数为 {attending_count}，要求出勤人数为 {total_required}"
-    
-    return True, "配置有效"
\ No newline at end of file
+    attending_count = report.counts['attending']
+    if total_required is not None and attending_count != total_required:
+        report.add_violation(
+            'total_attendance',
+            f"出勤人数不匹配：当前出勤人数为 {attending_count}，要求出勤人数为 {total_required}",
+            required=total_required, available=attending_count,
+        )
+
+    return report.feasible, report.message()